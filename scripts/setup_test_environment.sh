@@ -41,6 +41,9 @@ docker exec airline-orchestrator-db psql -U orchestrator -c "CREATE USER test_us
 
 docker exec airline-orchestrator-db psql -U orchestrator -c "GRANT ALL PRIVILEGES ON DATABASE test_airline_orchestrator TO test_user;" >/dev/null 2>&1
 
+# Test data is disposable, so commits don't wait for the WAL flush
+docker exec airline-orchestrator-db psql -U orchestrator -c "ALTER DATABASE test_airline_orchestrator SET synchronous_commit = off;" >/dev/null 2>&1
+
 echo -e "${GREEN}✓ Test database configured${NC}"
 
 # Verify Redis
@@ -1,11 +1,13 @@
 """HTTP client for communicating with agents."""
 
 import httpx
+import orjson
 import structlog
-from typing import Optional
-from pybreaker import CircuitBreaker, CircuitBreakerError
 import time
+from typing import Callable, Optional
 
+from src.agents.circuit import AsyncCircuitBreaker, CircuitOpenError
+from src.agents.http import get_shared_client
 from src.agents.base_agent import (
     BaseAgent,
     AgentMetadata,
@@ -16,14 +18,37 @@ from src.agents.base_agent import (
 
 logger = structlog.get_logger()
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _describe_error(exc: Exception) -> str:
+    """Short error description for AgentResponse.error."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"Agent returned HTTP {exc.response.status_code}"
+    if isinstance(exc, httpx.TimeoutException):
+        return f"Agent request timed out ({type(exc).__name__})"
+    if isinstance(exc, httpx.TransportError):
+        return f"Agent unreachable ({type(exc).__name__})"
+    return f"{type(exc).__name__}: {exc}"
+
 
 class AgentClient(BaseAgent):
     """HTTP client for remote agents with circuit breaker pattern."""
 
-    def __init__(self, metadata: AgentMetadata):
+    def __init__(
+        self,
+        metadata: AgentMetadata,
+        client: Optional[httpx.AsyncClient] = None,
+        on_status_change: Optional[Callable[[str, AgentStatus], None]] = None,
+    ):
         super().__init__(metadata)
-        self.client = httpx.AsyncClient(timeout=metadata.timeout)
-        self.circuit_breaker = CircuitBreaker(
+        # Agents share the process-wide client unless one is supplied
+        self.client = client if client is not None else get_shared_client()
+        # Called with the agent name and new status, so the registry's status
+        # index follows every health check
+        self.on_status_change = on_status_change
+        self.timeout = httpx.Timeout(metadata.timeout, connect=5.0)
+        self.circuit_breaker = AsyncCircuitBreaker(
             fail_max=5,
             timeout_duration=60,
             name=f"cb_{metadata.name}",
@@ -39,11 +64,11 @@ class AgentClient(BaseAgent):
         Returns:
             AgentResponse from the remote agent
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             response = await self._call_with_circuit_breaker(request)
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter() - start_time) * 1000
 
             response_data = AgentResponse(
                 agent_name=self.metadata.name,
@@ -61,8 +86,8 @@ class AgentClient(BaseAgent):
 
             return response_data
 
-        except CircuitBreakerError:
-            execution_time = (time.time() - start_time) * 1000
+        except CircuitOpenError:
+            execution_time = (time.perf_counter() - start_time) * 1000
             logger.error(
                 "circuit_breaker_open",
                 agent=self.metadata.name,
@@ -76,41 +101,35 @@ class AgentClient(BaseAgent):
             )
 
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
-            logger.error(
+            execution_time = (time.perf_counter() - start_time) * 1000
+            logger.exception(
                 "agent_execution_error",
                 agent=self.metadata.name,
                 session_id=request.session_id,
-                error=str(e),
             )
             return AgentResponse(
                 agent_name=self.metadata.name,
                 success=False,
-                error=str(e),
+                error=_describe_error(e),
                 execution_time_ms=execution_time,
             )
 
     async def _call_with_circuit_breaker(self, request: AgentRequest) -> dict:
         """Call agent with circuit breaker protection."""
+        return await self.circuit_breaker.call(self._do_request, request)
 
-        @self.circuit_breaker
-        async def _make_request():
-            payload = {
-                "session_id": request.session_id,
-                "user_id": request.user_id,
-                "message": request.message,
-                "context": request.context,
-                "metadata": request.metadata,
-            }
-
-            response = await self.client.post(
-                f"{self.metadata.url}/execute",
-                json=payload,
-            )
-            response.raise_for_status()
-            return response.json()
+    async def _do_request(self, request: AgentRequest) -> dict:
+        """Send the request to the agent's execute endpoint."""
+        payload = request.model_dump(mode="python")
 
-        return await _make_request()
+        response = await self.client.post(
+            f"{self.metadata.url}/execute",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def health_check(self) -> bool:
         """
@@ -127,9 +146,7 @@ class AgentClient(BaseAgent):
 
             is_healthy = response.status_code == 200
 
-            self.metadata.status = (
-                AgentStatus.HEALTHY if is_healthy else AgentStatus.DEGRADED
-            )
+            self._set_status(AgentStatus.HEALTHY if is_healthy else AgentStatus.DEGRADED)
 
             logger.info(
                 "health_check",
@@ -145,19 +162,17 @@ class AgentClient(BaseAgent):
                 agent=self.metadata.name,
                 error=str(e),
             )
-            self.metadata.status = AgentStatus.UNAVAILABLE
+            self._set_status(AgentStatus.UNAVAILABLE)
             return False
 
-    async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+    def _set_status(self, status: AgentStatus):
+        """Record the agent's status and report changes to on_status_change."""
+        if status == self.metadata.status:
+            return
 
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.close())
-        except Exception:
-            pass
+        self.metadata.status = status
+        if self.on_status_change is not None:
+            self.on_status_change(self.metadata.name, status)
+
+    async def close(self):
+        """Release agent resources. The shared HTTP client is closed on app shutdown."""
@@ -2,11 +2,11 @@
 
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from enum import StrEnum
 
 
-class AgentStatus(str, Enum):
+class AgentStatus(StrEnum):
     """Agent health status."""
     HEALTHY = "healthy"
     DEGRADED = "degraded"
@@ -15,12 +15,16 @@ class AgentStatus(str, Enum):
 
 class AgentCapability(BaseModel):
     """Agent capability model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     name: str
     description: Optional[str] = None
 
 
 class AgentMetadata(BaseModel):
     """Agent metadata model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     name: str
     domain: str
     url: str
@@ -35,6 +39,8 @@ class AgentMetadata(BaseModel):
 
 class AgentRequest(BaseModel):
     """Request to an agent."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     session_id: str
     user_id: str
     message: str
@@ -44,6 +50,8 @@ class AgentRequest(BaseModel):
 
 class AgentResponse(BaseModel):
     """Response from an agent."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     agent_name: str
     success: bool
     data: Optional[Dict[str, Any]] = None
@@ -0,0 +1,102 @@
+"""Async-native circuit breaker for agent calls."""
+
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class AsyncCircuitBreaker:
+    """
+    Circuit breaker for coroutines.
+
+    State only changes between awaits, so the event loop already serializes
+    every transition and no lock is needed. The closed-state fast path is a
+    single attribute check before awaiting the wrapped call.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, fail_max: int = 5, timeout_duration: float = 60, name: Optional[str] = None):
+        self.fail_max = fail_max
+        self.timeout_duration = timeout_duration
+        self.name = name
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a coroutine function with circuit breaker protection.
+
+        Args:
+            func: Coroutine function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self.state is self.CLOSED:
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                self._on_failure()
+                raise
+            self.failure_count = 0
+            return result
+
+        if self.state is self.OPEN:
+            if time.monotonic() - self.opened_at < self.timeout_duration:
+                raise CircuitOpenError(self.name)
+            self.state = self.HALF_OPEN
+            logger.info("circuit_breaker_half_open", breaker=self.name)
+
+        # Half-open: let a single trial call through
+        if self._trial_in_flight:
+            raise CircuitOpenError(self.name)
+
+        self._trial_in_flight = True
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self._open()
+            raise
+        finally:
+            self._trial_in_flight = False
+
+        self.reset()
+        return result
+
+    def _on_failure(self):
+        """Record a failure in the closed state."""
+        self.failure_count += 1
+        if self.failure_count >= self.fail_max:
+            self._open()
+
+    def _open(self):
+        """Trip the breaker."""
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(
+            "circuit_breaker_opened",
+            breaker=self.name,
+            failure_count=self.failure_count,
+        )
+
+    def reset(self):
+        """Close the breaker and clear the failure count."""
+        self.state = self.CLOSED
+        self.failure_count = 0
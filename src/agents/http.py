@@ -0,0 +1,45 @@
+"""Shared HTTP client for agent communication."""
+
+from typing import Optional
+
+import httpx
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client used for all agent calls.
+
+    httpx pools connections per host internally, so a single client serves
+    every agent. Per-agent timeouts are passed on each request.
+
+    Returns:
+        Shared AsyncClient instance
+    """
+    global _shared_client
+
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=0,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=30.0,
+                ),
+            ),
+        )
+
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the shared HTTP client."""
+    global _shared_client
+
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
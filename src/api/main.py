@@ -1,58 +1,80 @@
 """FastAPI main application."""
 
 import asyncio
-from contextlib import asynccontextmanager
+import logging
+import random
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from prometheus_client import make_asgi_app
+import orjson
 import structlog
 import redis.asyncio as redis
 import time
 
 from src.config.settings import settings
 from src.database.connection import Database
+from src.agents.http import close_shared_client
 from src.orchestrator.registry import AgentRegistry
 from src.orchestrator.context_manager import ContextManager
 from src.orchestrator.router import RequestRouter
+from src.orchestrator.response_cache import ResponseCache
 from src.auth.jwt_handler import JWTHandler
 from src.monitoring.metrics import MetricsCollector
+from src.monitoring.log_queue import QueueLoggerFactory, drain_log_queue
+from src.api.state import app_state, get_app_state
 from src.api.routes import router
 
-# Configure structured logging
+# Configure structured logging; calls below LOG_LEVEL are no-ops that never
+# reach the processor chain
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.format_exc_info,
         structlog.processors.JSONRenderer()
     ],
-    logger_factory=structlog.PrintLoggerFactory(),
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, settings.log_level.upper(), logging.INFO)
+    ),
+    logger_factory=QueueLoggerFactory(),
+    cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "success": False,
+    "error": "Internal server error",
+    "message": "An error occurred",
+})
 
-class AppState:
-    """Application state container."""
-    def __init__(self):
-        self.db: Database = None
-        self.redis_client: redis.Redis = None
-        self.registry: AgentRegistry = None
-        self.context_manager: ContextManager = None
-        self.router: RequestRouter = None
-        self.jwt_handler: JWTHandler = None
+_ROOT_BODY = orjson.dumps({
+    "service": "Airline Meta Agent Orchestrator",
+    "version": "1.0.0",
+    "status": "running",
+})
 
-
-app_state = AppState()
+# Healthy /health responses are reused for this many seconds
+HEALTH_CACHE_SECONDS = 1.0
+_health_body: bytes = b""
+_health_checked_at = 0.0
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
+    log_drainer = asyncio.create_task(drain_log_queue())
     logger.info("application_starting", environment=settings.environment)
 
     # Initialize database
-    app_state.db = Database(settings.database_url)
+    app_state.db = Database(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
     await app_state.db.create_tables()
+    MetricsCollector.update_db_connection_pool(settings.db_pool_size)
     logger.info("database_initialized")
 
     # Initialize Redis
@@ -66,16 +88,16 @@ async def lifespan(app: FastAPI):
 
     # Initialize agent registry
     app_state.registry = AgentRegistry(settings.agents_config_path)
-    await app_state.registry.load_agents()
+    await app_state.registry.load_agents(check_health=True)
     logger.info("agent_registry_initialized")
 
     # Initialize context manager
-    db_session = app_state.db.async_session()
     app_state.context_manager = ContextManager(
         redis_client=app_state.redis_client,
-        db_session=await anext(app_state.db.get_session()),
+        session_factory=app_state.db.async_session,
         ttl=3600,
     )
+    app_state.context_manager.start()
     logger.info("context_manager_initialized")
 
     # Initialize router
@@ -83,6 +105,10 @@ async def lifespan(app: FastAPI):
         registry=app_state.registry,
         context_manager=app_state.context_manager,
         anthropic_api_key=settings.anthropic_api_key,
+        response_cache=(
+            ResponseCache(app_state.redis_client, ttl=settings.response_cache_ttl)
+            if settings.response_cache_ttl > 0 else None
+        ),
     )
     logger.info("router_initialized")
 
@@ -91,6 +117,7 @@ async def lifespan(app: FastAPI):
         secret_key=settings.jwt_secret_key,
         algorithm=settings.jwt_algorithm,
         expiration_minutes=settings.jwt_expiration_minutes,
+        token_cache_size=settings.jwt_token_cache_size,
     )
     logger.info("jwt_handler_initialized")
 
@@ -106,10 +133,16 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     logger.info("application_shutting_down")
+    await app_state.router.close()
     await app_state.registry.close_all()
+    await close_shared_client()
+    await app_state.context_manager.close()
     await app_state.redis_client.close()
     await app_state.db.close()
     logger.info("application_shutdown_complete")
+    log_drainer.cancel()
+    with suppress(asyncio.CancelledError):
+        await log_drainer
 
 
 async def health_check_task():
@@ -117,10 +150,11 @@ async def health_check_task():
     while True:
         try:
             await app_state.registry.health_check_all()
-            await asyncio.sleep(30)  # Check every 30 seconds
         except Exception as e:
             logger.error("health_check_task_error", error=str(e))
-            await asyncio.sleep(30)
+
+        # Check every ~30 seconds, jittered so replicas don't probe in lockstep
+        await asyncio.sleep(30 + random.uniform(-3, 3))
 
 
 # Create FastAPI app
@@ -129,6 +163,7 @@ app = FastAPI(
     description="Production-ready orchestrator for airline domain agents",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -145,16 +180,25 @@ app.add_middleware(
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Add request processing time header and metrics."""
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     response = await call_next(request)
 
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     response.headers["X-Process-Time"] = str(process_time)
 
+    # Label by route template to keep metric cardinality bounded
+    route = request.scope.get("route")
+    if route is not None:
+        endpoint = route.path
+    elif response.status_code == 404:
+        endpoint = "unmatched"
+    else:
+        endpoint = request.url.path
+
     # Record metrics
     MetricsCollector.record_request(
-        endpoint=request.url.path,
+        endpoint=endpoint,
         method=request.method,
         status=response.status_code,
         duration=process_time,
@@ -174,12 +218,19 @@ async def global_exception_handler(request: Request, exc: Exception):
         error=str(exc),
     )
 
-    return JSONResponse(
+    if settings.environment != "development":
+        return Response(
+            _INTERNAL_ERROR_BODY,
+            status_code=500,
+            media_type="application/json",
+        )
+
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
             "error": "Internal server error",
-            "message": str(exc) if settings.environment == "development" else "An error occurred",
+            "message": str(exc),
         },
     )
 
@@ -195,32 +246,35 @@ app.mount("/metrics", metrics_app)
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "service": "Airline Meta Agent Orchestrator",
-        "version": "1.0.0",
-        "status": "running",
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
+    global _health_body, _health_checked_at
+
     try:
-        # Check Redis
-        await app_state.redis_client.ping()
-
-        # Get registry stats
-        stats = app_state.registry.get_registry_stats()
-
-        return {
-            "status": "healthy",
-            "redis": "connected",
-            "database": "connected",
-            "agents": stats,
-        }
+        now = time.monotonic()
+        if now - _health_checked_at >= HEALTH_CACHE_SECONDS:
+            # Check Redis
+            await app_state.redis_client.ping()
+
+            # Get registry stats
+            stats = app_state.registry.get_registry_stats()
+
+            _health_body = orjson.dumps({
+                "status": "healthy",
+                "redis": "connected",
+                "database": "connected",
+                "agents": stats,
+            }, option=orjson.OPT_NON_STR_KEYS)
+            _health_checked_at = now
+
+        return Response(_health_body, media_type="application/json")
     except Exception as e:
         logger.error("health_check_failed", error=str(e))
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -229,12 +283,6 @@ async def health():
         )
 
 
-# Dependency providers
-def get_app_state():
-    """Get application state."""
-    return app_state
-
-
 if __name__ == "__main__":
     import uvicorn
 
@@ -243,5 +291,8 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         workers=settings.api_workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower(),
+        access_log=False,
     )
@@ -3,16 +3,17 @@
 import uuid
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import structlog
 
 from src.database.models import User
 from src.auth.jwt_handler import JWTHandler
-from src.auth.dependencies import get_current_active_user
-from src.api.main import get_app_state
+from src.auth.dependencies import get_current_active_user, get_db
+from src.api.state import get_app_state
 
 logger = structlog.get_logger()
 security = HTTPBearer()
@@ -22,6 +23,8 @@ router = APIRouter()
 # Request/Response Models
 class ChatRequest(BaseModel):
     """Chat request model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     message: str = Field(..., description="User message to process")
     session_id: Optional[str] = Field(None, description="Session ID for context continuity")
     context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
@@ -29,6 +32,8 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     """Chat response model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     session_id: str
     success: bool
     message: str
@@ -39,6 +44,8 @@ class ChatResponse(BaseModel):
 
 class SessionResponse(BaseModel):
     """Session response model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     session_id: str
     user_id: str
     agent_chain: list[str]
@@ -47,12 +54,16 @@ class SessionResponse(BaseModel):
 
 class LoginRequest(BaseModel):
     """Login request model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     username: str
     password: str
 
 
 class LoginResponse(BaseModel):
     """Login response model."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     access_token: str
     token_type: str = "bearer"
     user_id: str
@@ -61,6 +72,8 @@ class LoginResponse(BaseModel):
 
 class RegisterRequest(BaseModel):
     """User registration request."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     username: str
     email: str
     password: str
@@ -68,6 +81,8 @@ class RegisterRequest(BaseModel):
 
 class AgentHealthResponse(BaseModel):
     """Agent health response."""
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     agent_name: str
     domain: str
     status: str
@@ -79,10 +94,9 @@ class AgentHealthResponse(BaseModel):
 async def register(
     request: RegisterRequest,
     app_state=Depends(get_app_state),
+    db_session: AsyncSession = Depends(get_db),
 ):
     """Register a new user."""
-    db_session = await anext(app_state.db.get_session())
-
     try:
         # Check if user exists
         result = await db_session.execute(
@@ -105,7 +119,7 @@ async def register(
             )
 
         # Create user
-        hashed_password = JWTHandler.hash_password(request.password)
+        hashed_password = await JWTHandler.hash_password_async(request.password)
         user = User(
             username=request.username,
             email=request.email,
@@ -117,15 +131,16 @@ async def register(
         await db_session.refresh(user)
 
         # Generate token
+        user_id = str(user.id)
         token = app_state.jwt_handler.create_access_token(
-            data={"sub": user.username, "user_id": str(user.id)}
+            data={"sub": user.username, "user_id": user_id}
         )
 
-        logger.info("user_registered", username=user.username, user_id=str(user.id))
+        logger.info("user_registered", username=user.username, user_id=user_id)
 
         return LoginResponse(
             access_token=token,
-            user_id=str(user.id),
+            user_id=user_id,
             username=user.username,
         )
 
@@ -144,10 +159,9 @@ async def register(
 async def login(
     request: LoginRequest,
     app_state=Depends(get_app_state),
+    db_session: AsyncSession = Depends(get_db),
 ):
     """Authenticate user and return JWT token."""
-    db_session = await anext(app_state.db.get_session())
-
     try:
         # Get user
         result = await db_session.execute(
@@ -155,7 +169,7 @@ async def login(
         )
         user = result.scalar_one_or_none()
 
-        if not user or not JWTHandler.verify_password(request.password, user.hashed_password):
+        if not user or not await JWTHandler.verify_password_async(request.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -169,15 +183,16 @@ async def login(
             )
 
         # Generate token
+        user_id = str(user.id)
         token = app_state.jwt_handler.create_access_token(
-            data={"sub": user.username, "user_id": str(user.id)}
+            data={"sub": user.username, "user_id": user_id}
         )
 
-        logger.info("user_logged_in", username=user.username, user_id=str(user.id))
+        logger.info("user_logged_in", username=user.username, user_id=user_id)
 
         return LoginResponse(
             access_token=token,
-            user_id=str(user.id),
+            user_id=user_id,
             username=user.username,
         )
 
@@ -202,19 +217,18 @@ async def chat(
     try:
         # Create or get session
         session_id = request.session_id or str(uuid.uuid4())
+        user_id = str(current_user.id)
 
         # Get or create session context
-        session = await app_state.context_manager.get_session(session_id)
-        if not session:
-            session = await app_state.context_manager.create_session(
-                session_id=session_id,
-                user_id=str(current_user.id),
-            )
+        session = await app_state.context_manager.get_or_create_session(
+            session_id=session_id,
+            user_id=user_id,
+        )
 
         # Route request through agents
         result = await app_state.router.route_request(
             session_id=session_id,
-            user_id=str(current_user.id),
+            user_id=user_id,
             message=request.message,
             context=request.context,
         )
@@ -222,18 +236,21 @@ async def chat(
         logger.info(
             "chat_processed",
             session_id=session_id,
-            user_id=str(current_user.id),
+            user_id=user_id,
             success=result.get("success", False),
         )
 
-        return ChatResponse(
+        # Returned as a response so the validated model is encoded by orjson
+        # directly, without FastAPI re-validating it and walking agent data
+        # through jsonable_encoder
+        return ORJSONResponse(ChatResponse(
             session_id=session_id,
             success=result.get("success", False),
             message=result.get("message", ""),
             data=result.get("data"),
             agents_used=result.get("agents_used", []),
             intent=result.get("intent"),
-        )
+        ).model_dump())
 
     except Exception as e:
         logger.error("chat_processing_error", error=str(e))
@@ -380,7 +397,7 @@ async def check_agent_health(
             detail="Agent not found"
         )
 
-    is_healthy = await agent.health_check()
+    await app_state.registry.check_agent_health(agent_name)
 
     return AgentHealthResponse(
         agent_name=agent.metadata.name,
@@ -0,0 +1,31 @@
+"""Application state shared by the app, routes and dependencies."""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis
+
+    from src.database.connection import Database
+    from src.orchestrator.registry import AgentRegistry
+    from src.orchestrator.context_manager import ContextManager
+    from src.orchestrator.router import RequestRouter
+    from src.auth.jwt_handler import JWTHandler
+
+
+class AppState:
+    """Application state container."""
+    def __init__(self):
+        self.db: "Database" = None
+        self.redis_client: "redis.Redis" = None
+        self.registry: "AgentRegistry" = None
+        self.context_manager: "ContextManager" = None
+        self.router: "RequestRouter" = None
+        self.jwt_handler: "JWTHandler" = None
+
+
+app_state = AppState()
+
+
+def get_app_state():
+    """Get application state."""
+    return app_state
@@ -1,32 +1,104 @@
 """Authentication dependencies for FastAPI."""
 
+import uuid
+from typing import AsyncIterator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+import orjson
+import redis.asyncio as redis
 import structlog
 
-from src.auth.jwt_handler import JWTHandler, TokenData
+from src.auth.jwt_handler import JWTHandler
 from src.database.models import User
-from src.database.connection import Database
+from src.api.state import get_app_state
 
 logger = structlog.get_logger()
 
 security = HTTPBearer()
 
+USER_CACHE_TTL = 60
+
+
+async def get_db(app_state=Depends(get_app_state)) -> AsyncIterator[AsyncSession]:
+    """
+    Get a database session for the current request.
+
+    Args:
+        app_state: Application state
+
+    Yields:
+        AsyncSession bound to the pooled engine
+    """
+    async with app_state.db.async_session() as session:
+        yield session
+
+
+def get_jwt_handler(app_state=Depends(get_app_state)) -> JWTHandler:
+    """Get the application JWT handler."""
+    return app_state.jwt_handler
+
+
+def get_redis(app_state=Depends(get_app_state)) -> redis.Redis:
+    """Get the application Redis client."""
+    return app_state.redis_client
+
+
+async def _get_cached_user(redis_client: redis.Redis, username: str) -> Optional[User]:
+    """Build a detached User from the Redis auth cache, if present."""
+    try:
+        cached = await redis_client.get(f"auth:u:{username}")
+    except Exception as e:
+        logger.warning("user_cache_read_error", username=username, error=str(e))
+        return None
+
+    if not cached:
+        return None
+
+    data = orjson.loads(cached)
+    return User(
+        id=uuid.UUID(data["id"]),
+        username=data["username"],
+        email=data["email"],
+        is_active=data["is_active"],
+    )
+
+
+async def _cache_user(redis_client: redis.Redis, user: User):
+    """Store a User snapshot in the Redis auth cache."""
+    try:
+        await redis_client.set(
+            f"auth:u:{user.username}",
+            orjson.dumps({
+                "id": str(user.id),
+                "username": user.username,
+                "email": user.email,
+                "is_active": user.is_active,
+            }),
+            ex=USER_CACHE_TTL,
+        )
+    except Exception as e:
+        logger.warning("user_cache_write_error", username=user.username, error=str(e))
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    jwt_handler: JWTHandler = Depends(),
-    db: AsyncSession = Depends(),
+    jwt_handler: JWTHandler = Depends(get_jwt_handler),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
 ) -> User:
     """
     Get current authenticated user.
 
+    Users are cached in Redis for USER_CACHE_TTL seconds so most requests
+    skip the database lookup.
+
     Args:
         credentials: HTTP authorization credentials
         jwt_handler: JWT handler instance
         db: Database session
+        redis_client: Redis client for the user cache
 
     Returns:
         User object
@@ -47,15 +119,20 @@ async def get_current_user(
         logger.warning("authentication_failed", reason="invalid_token")
         raise credentials_exception
 
-    # Get user from database
-    result = await db.execute(
-        select(User).where(User.username == token_data.username)
-    )
-    user = result.scalar_one_or_none()
+    user = await _get_cached_user(redis_client, token_data.username)
 
     if user is None:
-        logger.warning("authentication_failed", reason="user_not_found", username=token_data.username)
-        raise credentials_exception
+        # Get user from database
+        result = await db.execute(
+            select(User).where(User.username == token_data.username)
+        )
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            logger.warning("authentication_failed", reason="user_not_found", username=token_data.username)
+            raise credentials_exception
+
+        await _cache_user(redis_client, user)
 
     if not user.is_active:
         logger.warning("authentication_failed", reason="inactive_user", username=token_data.username)
@@ -69,24 +146,5 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """
-    Get current active user.
-
-    Args:
-        current_user: Current user from token
-
-    Returns:
-        User object
-
-    Raises:
-        HTTPException: If user is not active
-    """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user"
-        )
-    return current_user
+# get_current_user already rejects inactive users
+get_current_active_user = get_current_user
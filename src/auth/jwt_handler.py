@@ -1,15 +1,30 @@
 """JWT token handling."""
 
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
+import jwt
+from jwt.exceptions import PyJWTError
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import bcrypt
 from pydantic import BaseModel
 import structlog
 
 logger = structlog.get_logger()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_password_hasher() -> PasswordHasher:
+    """
+    Get the argon2id password hasher, created on first use.
+
+    New hashes use argon2id; existing bcrypt hashes are still accepted on verify.
+    """
+    return PasswordHasher()
 
 
 class TokenData(BaseModel):
@@ -21,10 +36,21 @@ class TokenData(BaseModel):
 class JWTHandler:
     """Handle JWT token creation and validation."""
 
-    def __init__(self, secret_key: str, algorithm: str = "HS256", expiration_minutes: int = 60):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        expiration_minutes: int = 60,
+        token_cache_size: int = 1024,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.expiration_minutes = expiration_minutes
+        self._algorithms = [algorithm]
+        self._decode_options = {"verify_aud": False}
+        # Verified token -> (claims, expiry timestamp); 0 disables the cache
+        self.token_cache_size = token_cache_size
+        self._verified_tokens: "OrderedDict[str, Tuple[TokenData, Optional[float]]]" = OrderedDict()
 
     def create_access_token(self, data: dict) -> str:
         """
@@ -56,8 +82,23 @@ class JWTHandler:
         Returns:
             TokenData if valid, None otherwise
         """
+        # Clients resend the same token on every request; a token that has
+        # already passed the signature check only needs its expiry rechecked
+        cached = self._verified_tokens.get(token)
+        if cached is not None:
+            token_data, expires_at = cached
+            if expires_at is None or time.time() < expires_at:
+                self._verified_tokens.move_to_end(token)
+                return token_data
+            del self._verified_tokens[token]
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = jwt.decode(
+                token,
+                self.secret_key,
+                algorithms=self._algorithms,
+                options=self._decode_options,
+            )
             username: str = payload.get("sub")
             user_id: str = payload.get("user_id")
 
@@ -65,18 +106,44 @@ class JWTHandler:
                 logger.warning("jwt_verification_failed", reason="missing_username")
                 return None
 
-            return TokenData(username=username, user_id=user_id)
+            token_data = TokenData(username=username, user_id=user_id)
+            if self.token_cache_size > 0:
+                self._verified_tokens[token] = (token_data, payload.get("exp"))
+                if len(self._verified_tokens) > self.token_cache_size:
+                    self._verified_tokens.popitem(last=False)
+            return token_data
 
-        except JWTError as e:
+        except PyJWTError as e:
             logger.error("jwt_verification_error", error=str(e))
             return None
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+        """Verify password against an argon2id or legacy bcrypt hash."""
+        if hashed_password.startswith("$argon2"):
+            try:
+                return get_password_hasher().verify(hashed_password, plain_password)
+            except (VerificationError, InvalidHashError):
+                return False
+
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
 
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash password."""
-        return pwd_context.hash(password)
+        """Hash password with argon2id."""
+        return get_password_hasher().hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Verify password in a worker thread so the event loop keeps serving requests."""
+        return await asyncio.to_thread(
+            JWTHandler.verify_password, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash password in a worker thread so the event loop keeps serving requests."""
+        return await asyncio.to_thread(JWTHandler.hash_password, password)
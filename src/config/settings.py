@@ -1,5 +1,6 @@
 """Application settings and configuration."""
 
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -21,17 +22,23 @@ class Settings(BaseSettings):
     postgres_db: str = "airline_orchestrator"
     postgres_user: str = "orchestrator"
     postgres_password: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
 
     # Redis Settings
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: Optional[str] = None
+    # Seconds a routed response is reused for an identical request; 0 disables
+    response_cache_ttl: int = 300
 
     # JWT Settings
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 60
+    # Verified tokens remembered to skip repeat signature checks; 0 disables
+    jwt_token_cache_size: int = 1024
 
     # Monitoring
     prometheus_port: int = 9090
@@ -43,12 +50,12 @@ class Settings(BaseSettings):
     # Agent Config
     agents_config_path: str = "src/config/agents_config.yaml"
 
-    @property
+    @cached_property
     def database_url(self) -> str:
         """Get PostgreSQL database URL."""
         return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
-    @property
+    @cached_property
     def redis_url(self) -> str:
         """Get Redis URL."""
         if self.redis_password:
@@ -60,4 +67,10 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Get the process-wide settings instance."""
+    return Settings()
+
+
+settings = get_settings()
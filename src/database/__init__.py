@@ -1,6 +1,13 @@
 """Database package."""
 
-from src.database.models import Base, ConversationHistory, User, AgentMetrics
+from src.database.models import Base, ConversationHistory, ConversationTurn, User, AgentMetrics
 from src.database.connection import Database
 
-__all__ = ["Base", "ConversationHistory", "User", "AgentMetrics", "Database"]
+__all__ = [
+    "Base",
+    "ConversationHistory",
+    "ConversationTurn",
+    "User",
+    "AgentMetrics",
+    "Database",
+]
@@ -1,22 +1,43 @@
 """Database connection management."""
 
+from typing import Any
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+import orjson
 import structlog
 
 from src.database.models import Base
 
 logger = structlog.get_logger()
 
+# Prepared statements cached per pooled connection: by SQLAlchemy's asyncpg
+# adapter for ORM/Core statements and by asyncpg for its own queries
+STATEMENT_CACHE_SIZE = 1024
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB bind values with orjson."""
+    return orjson.dumps(value).decode()
+
 
 class Database:
     """Database connection manager."""
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool_size: int = 5, max_overflow: int = 10):
         self.database_url = database_url
         self.engine = create_async_engine(
             database_url,
-            poolclass=NullPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=30,
+            pool_recycle=1800,
+            pool_pre_ping=True,
+            connect_args={
+                "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+                "statement_cache_size": STATEMENT_CACHE_SIZE,
+            },
+            # Used by the asyncpg dialect's json/jsonb type codecs
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
             echo=False,
         )
         self.async_session = async_sessionmaker(
@@ -1,28 +1,51 @@
 """Database models for PostgreSQL."""
 
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, JSON, Text
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 
 Base = declarative_base()
 
 
+class ConversationTurn(Base):
+    """User message of a conversation turn, shared by the turn's agent responses."""
+
+    __tablename__ = "conversation_turns"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id = Column(String(255), nullable=False)
+    user_id = Column(String(255), nullable=False)
+    user_message = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ConversationTurn(id={self.id}, session_id={self.session_id})>"
+
+
 class ConversationHistory(Base):
     """Conversation history table."""
 
     __tablename__ = "conversation_history"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(String(255), nullable=False, index=True)
+    session_id = Column(String(255), nullable=False)
     user_id = Column(String(255), nullable=False, index=True)
     agent_name = Column(String(255), nullable=False)
-    user_message = Column(Text, nullable=False)
+    # Rows saved per agent response reference their turn instead of repeating
+    # the user message
+    turn_id = Column(UUID(as_uuid=True), index=True)
+    user_message = Column(Text)
     agent_response = Column(Text, nullable=False)
-    metadata = Column(JSON, default={})
+    meta = Column("metadata", JSONB, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Serves the per-session history query (newest first) with a backward index scan
+    __table_args__ = (
+        Index("ix_conv_session_created", session_id, created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<ConversationHistory(id={self.id}, session_id={self.session_id}, agent={self.agent_name})>"
 
@@ -36,7 +59,7 @@ class User(Base):
     username = Column(String(255), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
-    is_active = Column(Integer, default=1)
+    is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -50,13 +73,17 @@ class AgentMetrics(Base):
     __tablename__ = "agent_metrics"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    agent_name = Column(String(255), nullable=False, index=True)
+    agent_name = Column(String(255), nullable=False)
     session_id = Column(String(255), nullable=False)
     execution_time_ms = Column(Integer)
-    success = Column(Integer, nullable=False)  # 1 for success, 0 for failure
+    success = Column(Boolean, nullable=False)
     error_message = Column(Text)
-    metadata = Column(JSON, default={})
+    meta = Column("metadata", JSONB, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_agent_metrics_agent_created", agent_name, created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<AgentMetrics(id={self.id}, agent={self.agent_name}, success={self.success})>"
@@ -0,0 +1,87 @@
+"""Non-blocking structlog output via a bounded queue and background drainer."""
+
+import asyncio
+import sys
+from typing import Any, List, Optional, TextIO
+
+QUEUE_SIZE = 10000
+
+# Queue of the latest drainer and the event loop it runs on. Each drainer
+# creates its own queue, since an asyncio.Queue is bound to the first loop
+# that waits on it.
+_queue: "Optional[asyncio.Queue[str]]" = None
+_queue_loop: Optional[asyncio.AbstractEventLoop] = None
+dropped_count = 0
+
+
+class QueueLogger:
+    """structlog logger that enqueues rendered lines instead of printing them."""
+
+    def msg(self, message: str):
+        """
+        Enqueue a rendered log line.
+
+        Lines are written through when no drainer is running, or when logged
+        outside the drainer's event loop, since the queue is not thread-safe.
+        """
+        global dropped_count
+
+        queue = _queue
+        if queue is None or _running_loop() is not _queue_loop:
+            sys.stdout.write(message + "\n")
+            sys.stdout.flush()
+            return
+
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            dropped_count += 1
+
+    log = debug = info = warn = warning = msg
+    err = error = critical = exception = fatal = failure = msg
+
+
+class QueueLoggerFactory:
+    """Factory producing QueueLogger instances for structlog.configure()."""
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the running event loop, or None outside one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _take_pending(queue: "asyncio.Queue[str]", lines: List[str]) -> List[str]:
+    """Move every queued line into lines without waiting."""
+    while not queue.empty():
+        lines.append(queue.get_nowait())
+    return lines
+
+
+def _write_batch(file: TextIO, lines: List[str]):
+    """Write a batch of lines with a single flush."""
+    if lines:
+        file.write("\n".join(lines) + "\n")
+        file.flush()
+
+
+async def drain_log_queue(file: Optional[TextIO] = None):
+    """Background task that writes queued log lines in batches."""
+    global _queue, _queue_loop
+
+    file = file or sys.stdout
+    queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _queue, _queue_loop = queue, asyncio.get_running_loop()
+    try:
+        while True:
+            first = await queue.get()
+            _write_batch(file, _take_pending(queue, [first]))
+    finally:
+        if _queue is queue:
+            _queue, _queue_loop = None, None
+        _write_batch(file, _take_pending(queue, []))
@@ -1,5 +1,6 @@
 """Prometheus metrics for monitoring."""
 
+from functools import lru_cache
 from prometheus_client import Counter, Histogram, Gauge, Info
 import structlog
 
@@ -87,42 +88,91 @@ app_info = Info(
 )
 
 
+# Labelled children, resolved once per label combination. Label values
+# (routes, agent names, domains) are bounded, so the caches stay small.
+@lru_cache(maxsize=2048)
+def _request_count_child(endpoint: str, method: str, status: int):
+    return request_count.labels(endpoint=endpoint, method=method, status=status)
+
+
+@lru_cache(maxsize=2048)
+def _request_duration_child(endpoint: str, method: str):
+    return request_duration.labels(endpoint=endpoint, method=method)
+
+
+@lru_cache(maxsize=2048)
+def _agent_requests_child(agent_name: str, status: str):
+    return agent_requests.labels(agent_name=agent_name, status=status)
+
+
+@lru_cache(maxsize=2048)
+def _agent_duration_child(agent_name: str):
+    return agent_duration.labels(agent_name=agent_name)
+
+
+@lru_cache(maxsize=2048)
+def _agent_failures_child(agent_name: str, error_type: str):
+    return agent_failures.labels(agent_name=agent_name, error_type=error_type)
+
+
+@lru_cache(maxsize=2048)
+def _agent_health_child(agent_name: str, domain: str):
+    return agent_health_status.labels(agent_name=agent_name, domain=domain)
+
+
+@lru_cache(maxsize=2048)
+def _circuit_breaker_state_child(agent_name: str):
+    return circuit_breaker_state.labels(agent_name=agent_name)
+
+
+@lru_cache(maxsize=2048)
+def _circuit_breaker_failures_child(agent_name: str):
+    return circuit_breaker_failures.labels(agent_name=agent_name)
+
+
+@lru_cache(maxsize=2048)
+def _db_query_child(operation: str):
+    return db_query_duration.labels(operation=operation)
+
+
+CIRCUIT_BREAKER_STATES = {"closed": 0, "open": 1, "half_open": 2}
+
+
 class MetricsCollector:
     """Collect and update metrics."""
 
     @staticmethod
     def record_request(endpoint: str, method: str, status: int, duration: float):
         """Record HTTP request metrics."""
-        request_count.labels(endpoint=endpoint, method=method, status=status).inc()
-        request_duration.labels(endpoint=endpoint, method=method).observe(duration)
+        _request_count_child(endpoint, method, status).inc()
+        _request_duration_child(endpoint, method).observe(duration)
 
     @staticmethod
     def record_agent_request(agent_name: str, success: bool, duration: float):
         """Record agent request metrics."""
         status = "success" if success else "failure"
-        agent_requests.labels(agent_name=agent_name, status=status).inc()
-        agent_duration.labels(agent_name=agent_name).observe(duration / 1000)  # Convert ms to seconds
+        _agent_requests_child(agent_name, status).inc()
+        _agent_duration_child(agent_name).observe(duration / 1000)  # Convert ms to seconds
 
     @staticmethod
     def record_agent_failure(agent_name: str, error_type: str):
         """Record agent failure."""
-        agent_failures.labels(agent_name=agent_name, error_type=error_type).inc()
+        _agent_failures_child(agent_name, error_type).inc()
 
     @staticmethod
     def update_agent_health(agent_name: str, domain: str, is_healthy: bool):
         """Update agent health status."""
-        agent_health_status.labels(agent_name=agent_name, domain=domain).set(1 if is_healthy else 0)
+        _agent_health_child(agent_name, domain).set(1 if is_healthy else 0)
 
     @staticmethod
     def update_circuit_breaker_state(agent_name: str, state: str):
         """Update circuit breaker state."""
-        state_map = {"closed": 0, "open": 1, "half_open": 2}
-        circuit_breaker_state.labels(agent_name=agent_name).set(state_map.get(state, 0))
+        _circuit_breaker_state_child(agent_name).set(CIRCUIT_BREAKER_STATES.get(state, 0))
 
     @staticmethod
     def record_circuit_breaker_failure(agent_name: str):
         """Record circuit breaker failure."""
-        circuit_breaker_failures.labels(agent_name=agent_name).inc()
+        _circuit_breaker_failures_child(agent_name).inc()
 
     @staticmethod
     def update_active_sessions(count: int):
@@ -137,7 +187,12 @@ class MetricsCollector:
     @staticmethod
     def record_db_query(operation: str, duration: float):
         """Record database query duration."""
-        db_query_duration.labels(operation=operation).observe(duration)
+        _db_query_child(operation).observe(duration)
+
+    @staticmethod
+    def update_db_connection_pool(size: int):
+        """Update database connection pool size."""
+        db_connection_pool.set(size)
 
     @staticmethod
     def set_app_info(version: str, environment: str):
@@ -1,18 +1,87 @@
 """Context manager for maintaining conversation state across agents."""
 
-import json
+import asyncio
+import base64
+import time
+import uuid
+import orjson
 import structlog
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+import zstandard as zstd
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 import redis.asyncio as redis
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import func, insert, select
 
-from src.database.models import ConversationHistory
+from src.agents.base_agent import AgentResponse
+from src.database.models import ConversationHistory, ConversationTurn
 
 logger = structlog.get_logger()
 
 
+def _session_keys(session_id: str) -> Tuple[str, str, str]:
+    """Redis keys for a session's fields hash, agent chain list and variables hash."""
+    key = f"session:{session_id}"
+    return key, f"{key}:chain", f"{key}:vars"
+
+
+# Appends to the agent chain, merges variables and refreshes the TTL of all
+# session keys, returning the updated session in the same round trip.
+# KEYS: session hash, chain list, vars hash
+# ARGV: ttl, updated_at, number of agent names, the agent names, then variable
+# name/value pairs
+UPDATE_SESSION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local agent_count = tonumber(ARGV[3])
+if agent_count > 0 then
+    redis.call('RPUSH', KEYS[2], unpack(ARGV, 4, 3 + agent_count))
+end
+if #ARGV > 3 + agent_count then
+    redis.call('HSET', KEYS[3], unpack(ARGV, 4 + agent_count))
+end
+redis.call('HSET', KEYS[1], 'updated_at', ARGV[2])
+for i = 1, 3 do
+    redis.call('EXPIRE', KEYS[i], ARGV[1])
+end
+return {
+    redis.call('HGETALL', KEYS[1]),
+    redis.call('LRANGE', KEYS[2], 0, -1),
+    redis.call('HGETALL', KEYS[3]),
+}
+"""
+
+
+# Context variables whose JSON encoding reaches COMPRESS_MIN_BYTES are stored
+# zstd-compressed. The Redis client decodes responses as text, so compressed
+# values are base64-encoded behind a prefix that no JSON document starts with.
+COMPRESS_MIN_BYTES = 1024
+COMPRESSED_PREFIX = "~"
+_compressor = zstd.ZstdCompressor(level=1)
+_decompressor = zstd.ZstdDecompressor()
+
+
+def _encode_value(value: Any) -> bytes:
+    """Encode a context variable for storage in the vars hash."""
+    raw = orjson.dumps(value)
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return raw
+    return COMPRESSED_PREFIX.encode() + base64.b64encode(_compressor.compress(raw))
+
+
+def _decode_value(stored: str) -> Any:
+    """Decode a context variable read from the vars hash."""
+    if stored.startswith(COMPRESSED_PREFIX):
+        return orjson.loads(_decompressor.decompress(base64.b64decode(stored[1:])))
+    return orjson.loads(stored)
+
+
+def _pairs_to_dict(flat: List[Any]) -> Dict[Any, Any]:
+    """Convert a flat HGETALL reply from a Lua script into a dict."""
+    return dict(zip(flat[::2], flat[1::2]))
+
+
 class SessionContext:
     """Session context model."""
 
@@ -27,8 +96,7 @@ class SessionContext:
         self.user_id = user_id
         self.agent_chain = agent_chain or []
         self.context_variables = context_variables or {}
-        self.created_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.created_at = self.updated_at = datetime.now(timezone.utc)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -37,8 +105,8 @@ class SessionContext:
             "user_id": self.user_id,
             "agent_chain": self.agent_chain,
             "context_variables": self.context_variables,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at.timestamp(),
+            "updated_at": self.updated_at.timestamp(),
         }
 
     @classmethod
@@ -50,10 +118,11 @@ class SessionContext:
             agent_chain=data.get("agent_chain", []),
             context_variables=data.get("context_variables", {}),
         )
+        # Timestamps are epoch seconds; Redis hashes return them as strings
         if "created_at" in data:
-            context.created_at = datetime.fromisoformat(data["created_at"])
+            context.created_at = datetime.fromtimestamp(float(data["created_at"]), timezone.utc)
         if "updated_at" in data:
-            context.updated_at = datetime.fromisoformat(data["updated_at"])
+            context.updated_at = datetime.fromtimestamp(float(data["updated_at"]), timezone.utc)
         return context
 
 
@@ -63,12 +132,40 @@ class ContextManager:
     def __init__(
         self,
         redis_client: redis.Redis,
-        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
         ttl: int = 3600,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
     ):
         self.redis = redis_client
-        self.db_session = db_session
+        self.session_factory = session_factory
         self.ttl = ttl
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Queued rows, plus futures that get_conversation_history waits on
+        # until the rows queued before them are written
+        self._conversation_queue: asyncio.Queue = asyncio.Queue()
+        self._unwritten_rows = 0
+        self._writer_task: Optional[asyncio.Task] = None
+        self._update_script = redis_client.register_script(UPDATE_SESSION_LUA)
+
+    def start(self):
+        """Start the background conversation writer."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._conversation_writer())
+
+    async def close(self):
+        """Flush pending conversations and stop the background writer."""
+        if self._writer_task is None:
+            return
+
+        await self._conversation_queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
 
     async def create_session(
         self, session_id: str, user_id: str
@@ -85,12 +182,49 @@ class ContextManager:
 
         return context
 
+    async def get_or_create_session(
+        self, session_id: str, user_id: str
+    ) -> SessionContext:
+        """Get a session, creating it if missing, in a single Redis round trip."""
+        key, chain_key, vars_key = _session_keys(session_id)
+        context = SessionContext(session_id=session_id, user_id=user_id)
+
+        # HSETNX only fills fields on a new session; EXPIRE NX only sets its TTL
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for field, value in self._session_fields(context).items():
+                pipe.hsetnx(key, field, value)
+            pipe.expire(key, self.ttl, nx=True)
+            pipe.hgetall(key)
+            pipe.lrange(chain_key, 0, -1)
+            pipe.hgetall(vars_key)
+            results = await pipe.execute()
+
+        created = results[0]
+        fields, chain, variables = results[-3:]
+
+        if created:
+            logger.info(
+                "session_created",
+                session_id=session_id,
+                user_id=user_id,
+            )
+            return context
+
+        return self._context_from_redis(fields, chain, variables)
+
     async def get_session(self, session_id: str) -> Optional[SessionContext]:
         """Get session from Redis."""
         try:
-            data = await self.redis.get(f"session:{session_id}")
-            if data:
-                context = SessionContext.from_dict(json.loads(data))
+            key, chain_key, vars_key = _session_keys(session_id)
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hgetall(key)
+                pipe.lrange(chain_key, 0, -1)
+                pipe.hgetall(vars_key)
+                fields, chain, variables = await pipe.execute()
+
+            if fields:
+                context = self._context_from_redis(fields, chain, variables)
                 logger.debug("session_retrieved", session_id=session_id)
                 return context
 
@@ -105,40 +239,134 @@ class ContextManager:
             )
             return None
 
+    async def get_sessions(self, session_ids: List[str]) -> Dict[str, SessionContext]:
+        """
+        Get several sessions from Redis in a single round trip.
+
+        Args:
+            session_ids: Session IDs to load
+
+        Returns:
+            Mapping of session ID to context for the sessions that exist
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    key, chain_key, vars_key = _session_keys(session_id)
+                    pipe.hgetall(key)
+                    pipe.lrange(chain_key, 0, -1)
+                    pipe.hgetall(vars_key)
+                results = await pipe.execute()
+
+            sessions = {}
+            for i, session_id in enumerate(session_ids):
+                fields, chain, variables = results[3 * i:3 * i + 3]
+                if fields:
+                    sessions[session_id] = self._context_from_redis(fields, chain, variables)
+
+            logger.debug(
+                "sessions_retrieved",
+                requested=len(session_ids),
+                found=len(sessions),
+            )
+            return sessions
+
+        except Exception as e:
+            logger.error(
+                "session_retrieval_error",
+                session_ids=session_ids,
+                error=str(e),
+            )
+            return {}
+
     async def update_session(
         self,
         session_id: str,
         agent_name: Optional[str] = None,
         context_variables: Optional[Dict[str, Any]] = None,
+        agent_names: Optional[List[str]] = None,
     ) -> Optional[SessionContext]:
-        """Update session context."""
-        context = await self.get_session(session_id)
-        if not context:
+        """
+        Update session context in a single Redis round trip.
+
+        Args:
+            session_id: Session identifier
+            agent_name: Agent to append to the agent chain
+            context_variables: Variables to merge into the session
+            agent_names: Several agents to append to the agent chain, in order
+
+        Returns:
+            The updated session, or None if it does not exist
+        """
+        names = [agent_name] if agent_name else []
+        if agent_names:
+            names.extend(agent_names)
+
+        args = [self.ttl, time.time(), len(names), *names]
+        if context_variables:
+            for name, value in self._encode_variables(context_variables).items():
+                args.extend((name, value))
+
+        result = await self._update_script(keys=list(_session_keys(session_id)), args=args)
+        if not result:
             logger.warning("session_not_found_for_update", session_id=session_id)
             return None
 
-        if agent_name:
-            context.agent_chain.append(agent_name)
-
-        if context_variables:
-            context.context_variables.update(context_variables)
-
-        context.updated_at = datetime.utcnow()
-        await self._save_to_redis(context)
+        fields, chain, variables = result
+        context = self._context_from_redis(
+            _pairs_to_dict(fields), chain, _pairs_to_dict(variables)
+        )
 
         logger.info(
             "session_updated",
             session_id=session_id,
-            agent=agent_name,
+            agents=names,
         )
 
         return context
 
     async def _save_to_redis(self, context: SessionContext):
         """Save session to Redis with TTL."""
-        key = f"session:{context.session_id}"
-        value = json.dumps(context.to_dict())
-        await self.redis.setex(key, self.ttl, value)
+        key, chain_key, vars_key = _session_keys(context.session_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(chain_key, vars_key)
+            pipe.hset(key, mapping=self._session_fields(context))
+            if context.agent_chain:
+                pipe.rpush(chain_key, *context.agent_chain)
+            if context.context_variables:
+                pipe.hset(vars_key, mapping=self._encode_variables(context.context_variables))
+            for k in (key, chain_key, vars_key):
+                pipe.expire(k, self.ttl)
+            await pipe.execute()
+
+    @staticmethod
+    def _session_fields(context: SessionContext) -> Dict[str, Any]:
+        """Scalar session fields stored in the session hash."""
+        return {
+            "session_id": context.session_id,
+            "user_id": context.user_id,
+            "created_at": context.created_at.timestamp(),
+            "updated_at": context.updated_at.timestamp(),
+        }
+
+    @staticmethod
+    def _encode_variables(variables: Dict[str, Any]) -> Dict[str, bytes]:
+        """Encode context variables as hash values."""
+        return {name: _encode_value(value) for name, value in variables.items()}
+
+    @staticmethod
+    def _context_from_redis(
+        fields: Dict[str, str], chain: List[str], variables: Dict[str, str]
+    ) -> SessionContext:
+        """Build a SessionContext from the session hash, chain list and variables hash."""
+        return SessionContext.from_dict({
+            **fields,
+            "agent_chain": chain,
+            "context_variables": {
+                name: _decode_value(value) for name, value in variables.items()
+            },
+        })
 
     async def save_conversation(
         self,
@@ -149,31 +377,146 @@ class ContextManager:
         agent_response: str,
         metadata: Optional[Dict[str, Any]] = None,
     ):
-        """Save conversation to PostgreSQL for history."""
-        try:
-            conversation = ConversationHistory(
-                session_id=session_id,
-                user_id=user_id,
-                agent_name=agent_name,
-                user_message=user_message,
-                agent_response=agent_response,
-                metadata=metadata or {},
-            )
+        """
+        Save conversation to PostgreSQL for history.
+
+        Rows are queued for the background writer, which inserts them in
+        batches. Without a running writer the row is written immediately.
+        """
+        await self._queue_rows([(ConversationHistory, {
+            "session_id": session_id,
+            "user_id": user_id,
+            "agent_name": agent_name,
+            "turn_id": None,
+            "user_message": user_message,
+            "agent_response": agent_response,
+            "meta": metadata or {},
+            "created_at": datetime.utcnow(),
+        })])
+
+    async def begin_turn(self, session_id: str, user_id: str, user_message: str) -> uuid.UUID:
+        """
+        Save the user message of a new turn.
+
+        Args:
+            session_id: Session identifier
+            user_id: User identifier
+            user_message: The user's message
+
+        Returns:
+            Turn ID to pass to save_agent_responses
+        """
+        turn_id = uuid.uuid4()
+        await self._queue_rows([(ConversationTurn, {
+            "id": turn_id,
+            "session_id": session_id,
+            "user_id": user_id,
+            "user_message": user_message,
+            "created_at": datetime.utcnow(),
+        })])
+        return turn_id
+
+    async def save_agent_responses(
+        self,
+        turn_id: uuid.UUID,
+        session_id: str,
+        user_id: str,
+        responses: List[AgentResponse],
+    ):
+        """
+        Save several agents' responses to a turn as one batch.
+
+        Args:
+            turn_id: Turn ID returned by begin_turn
+            session_id: Session identifier
+            user_id: User identifier
+            responses: Agent responses to save
+        """
+        created_at = datetime.utcnow()
+        await self._queue_rows([
+            (ConversationHistory, {
+                "session_id": session_id,
+                "user_id": user_id,
+                "agent_name": response.agent_name,
+                "turn_id": turn_id,
+                "user_message": None,
+                "agent_response": response.message or "",
+                "meta": response.metadata or {},
+                "created_at": created_at,
+            })
+            for response in responses
+        ])
+
+    async def _queue_rows(self, rows: List[Tuple[type, Dict[str, Any]]]):
+        """Queue rows for the background writer, or write them now if none is running."""
+        if self._writer_task is None:
+            await self._write_conversations(rows)
+            return
+
+        for row in rows:
+            self._conversation_queue.put_nowait(row)
+        self._unwritten_rows += len(rows)
+
+    async def _flush_queued(self):
+        """Wait until the rows queued so far are written, ignoring rows queued later."""
+        if self._writer_task is None or not self._unwritten_rows:
+            return
+
+        flushed = asyncio.get_running_loop().create_future()
+        self._conversation_queue.put_nowait(flushed)
+        await flushed
+
+    async def _conversation_writer(self):
+        """Drain queued conversations and insert them in batches."""
+        while True:
+            items = [await self._conversation_queue.get()]
+            self._take_queued(items)
+            waiters = [item for item in items if isinstance(item, asyncio.Future)]
+            # A waiting reader flushes the batch now rather than after the interval
+            if len(items) < self.batch_size and not waiters:
+                await asyncio.sleep(self.flush_interval)
+                self._take_queued(items)
+                waiters = [item for item in items if isinstance(item, asyncio.Future)]
+
+            rows = [item for item in items if not isinstance(item, asyncio.Future)]
+            try:
+                if rows:
+                    await self._write_conversations(rows)
+            finally:
+                self._unwritten_rows -= len(rows)
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                for _ in items:
+                    self._conversation_queue.task_done()
+
+    def _take_queued(self, items: List[Any]):
+        """Move queued items into items, up to batch_size."""
+        while len(items) < self.batch_size and not self._conversation_queue.empty():
+            items.append(self._conversation_queue.get_nowait())
+
+    async def _write_conversations(self, rows: List[Tuple[type, Dict[str, Any]]]):
+        """Insert queued rows with one statement per table and commit."""
+        by_model: Dict[type, List[Dict[str, Any]]] = {}
+        for model, row in rows:
+            by_model.setdefault(model, []).append(row)
 
-            self.db_session.add(conversation)
-            await self.db_session.commit()
+        try:
+            async with self.session_factory() as db_session:
+                for model, model_rows in by_model.items():
+                    await db_session.execute(insert(model), model_rows)
+                await db_session.commit()
 
             logger.info(
-                "conversation_saved",
-                session_id=session_id,
-                agent=agent_name,
+                "conversations_saved",
+                count=len(rows),
+                session_ids=list({row["session_id"] for _, row in rows}),
             )
 
         except Exception as e:
-            await self.db_session.rollback()
             logger.error(
                 "conversation_save_error",
-                session_id=session_id,
+                count=len(rows),
                 error=str(e),
             )
 
@@ -182,25 +525,43 @@ class ContextManager:
     ) -> List[Dict[str, Any]]:
         """Get conversation history from PostgreSQL."""
         try:
-            result = await self.db_session.execute(
-                select(ConversationHistory)
+            # Make sure turns queued before this read are visible
+            await self._flush_queued()
+
+            # Newest `limit` turns in the subquery, returned oldest first. Rows
+            # saved per agent response take the user message from their turn.
+            recent = (
+                select(
+                    ConversationHistory.agent_name,
+                    func.coalesce(
+                        ConversationHistory.user_message, ConversationTurn.user_message
+                    ).label("user_message"),
+                    ConversationHistory.agent_response,
+                    ConversationHistory.created_at,
+                    ConversationHistory.meta,
+                )
+                .outerjoin(ConversationTurn, ConversationHistory.turn_id == ConversationTurn.id)
                 .where(ConversationHistory.session_id == session_id)
                 .order_by(ConversationHistory.created_at.desc())
                 .limit(limit)
+                .subquery()
             )
 
-            conversations = result.scalars().all()
-
-            history = [
-                {
-                    "agent_name": conv.agent_name,
-                    "user_message": conv.user_message,
-                    "agent_response": conv.agent_response,
-                    "created_at": conv.created_at.isoformat(),
-                    "metadata": conv.metadata,
-                }
-                for conv in reversed(conversations)
-            ]
+            async with self.session_factory() as db_session:
+                result = await db_session.execute(
+                    select(recent).order_by(recent.c.created_at)
+                )
+
+                history = [
+                    {
+                        "agent_name": agent_name,
+                        "user_message": user_message,
+                        "agent_response": agent_response,
+                        "created_at": created_at.isoformat(),
+                        "metadata": meta,
+                    }
+                    for agent_name, user_message, agent_response, created_at, meta in result
+                ]
 
             logger.info(
                 "conversation_history_retrieved",
@@ -221,7 +582,7 @@ class ContextManager:
     async def delete_session(self, session_id: str):
         """Delete session from Redis."""
         try:
-            await self.redis.delete(f"session:{session_id}")
+            await self.redis.delete(*_session_keys(session_id))
             logger.info("session_deleted", session_id=session_id)
         except Exception as e:
             logger.error(
@@ -233,8 +594,10 @@ class ContextManager:
     async def extend_session(self, session_id: str):
         """Extend session TTL."""
         try:
-            key = f"session:{session_id}"
-            await self.redis.expire(key, self.ttl)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in _session_keys(session_id):
+                    pipe.expire(key, self.ttl)
+                await pipe.execute()
             logger.debug("session_ttl_extended", session_id=session_id)
         except Exception as e:
             logger.error(
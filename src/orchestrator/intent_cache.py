@@ -0,0 +1,109 @@
+"""Exact and fuzzy cache for intent classifications."""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+# Tokens containing a digit (flight numbers, bag tags, trip IDs) are replaced
+# so that queries differing only in identifiers share a template
+_ID_TOKEN = re.compile(r"\b(?=\w*\d)\w+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, mask identifiers and collapse whitespace."""
+    masked = _ID_TOKEN.sub("#", message.lower())
+    return _WHITESPACE.sub(" ", masked).strip()
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(tokens: Iterable[str]) -> int:
+    """64-bit simhash over the given tokens."""
+    weights = [0] * 64
+    for token in tokens:
+        h = _hash64(token)
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _shingles(normalized: str) -> Iterable[str]:
+    """Word unigrams and bigrams of a normalized message."""
+    words = normalized.split(" ")
+    yield from words
+    for first, second in zip(words, words[1:]):
+        yield f"{first} {second}"
+
+
+class IntentCache:
+    """
+    LRU cache of intent classifications keyed by normalized message.
+
+    Lookups first try an exact match on the normalized message and then fall
+    back to the closest simhash within max_distance bits. Entries are scoped
+    (e.g. by the registry's domains and capabilities) so a registry change
+    never serves a classification built against a different agent set.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_distance: int = 3):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        # key -> (simhash, classification)
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], Tuple[int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(scope: Hashable, normalized: str) -> Tuple[Hashable, bytes]:
+        return scope, hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+    def get(self, message: str, scope: Hashable) -> Optional[Any]:
+        """
+        Get a cached classification for message, or None.
+
+        Classifications are returned as stored, so they should be immutable.
+        """
+        normalized = normalize_message(message)
+        key = self._key(scope, normalized)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        fingerprint = simhash(_shingles(normalized))
+        for candidate_key, (candidate_hash, classification) in self._entries.items():
+            if candidate_key[0] != scope:
+                continue
+            if (fingerprint ^ candidate_hash).bit_count() <= self.max_distance:
+                self._entries.move_to_end(candidate_key)
+                self.fuzzy_hits += 1
+                return classification
+
+        self.misses += 1
+        return None
+
+    def put(self, message: str, scope: Hashable, classification: Any):
+        """Cache a classification for message."""
+        normalized = normalize_message(message)
+        key = self._key(scope, normalized)
+
+        self._entries[key] = (simhash(_shingles(normalized)), classification)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached classifications."""
+        self._entries.clear()
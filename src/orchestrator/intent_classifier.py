@@ -0,0 +1,82 @@
+"""Keyword fast path for intent classification."""
+
+import re
+from typing import NamedTuple, Optional, Sequence
+
+
+class IntentRule(NamedTuple):
+    """Maps messages matching pattern to a single capability."""
+    capability: str
+    intent: str
+    pattern: re.Pattern
+
+
+DEFAULT_RULES = (
+    IntentRule(
+        "track",
+        "locate baggage",
+        re.compile(
+            r"\b(where|track|trace|locate|find|status)\b.*\b(bag|bags|baggage|luggage|suitcase)\b"
+            r"|\b(bag|bags|baggage|luggage|suitcase)\b.*\b(where|location|status)\b",
+            re.IGNORECASE,
+        ),
+    ),
+    IntentRule(
+        "pay_validation",
+        "validate crew pay",
+        re.compile(r"\b(validate|verify|check|audit)\b.*\bpay\b|\bcrew pay\b", re.IGNORECASE),
+    ),
+    IntentRule(
+        "schedule_analysis",
+        "analyze crew schedule",
+        re.compile(
+            r"\bcrew\b.*\b(schedules?|availability|rosters?|pairings?)\b",
+            re.IGNORECASE,
+        ),
+    ),
+)
+
+# Conjunctions and clause breaks suggest a multi-part request for the LLM
+COMPOUND_PATTERN = re.compile(r"\b(and|then|also|but|if|whether|will|should)\b|[,;]", re.IGNORECASE)
+
+URGENT_PATTERN = re.compile(r"\b(urgent|urgently|asap|immediately|right now)\b", re.IGNORECASE)
+
+
+class IntentClassifier:
+    """
+    Rule-based classifier for unambiguous single-capability requests.
+
+    A message is classified only when exactly one rule matches; anything
+    else (no match, several capabilities, compound or long free-form
+    requests) is left to the LLM.
+    """
+
+    def __init__(self, rules: Sequence[IntentRule] = DEFAULT_RULES, max_words: int = 25):
+        self.rules = tuple(rules)
+        self.max_words = max_words
+
+    def classify(self, message: str) -> Optional[IntentRule]:
+        """
+        Get the single rule matching message.
+
+        Args:
+            message: The user's message
+
+        Returns:
+            The matching rule, or None if the message needs the LLM
+        """
+        if len(message.split()) > self.max_words or COMPOUND_PATTERN.search(message):
+            return None
+
+        matched = None
+        for rule in self.rules:
+            if rule.pattern.search(message):
+                if matched is not None:
+                    return None
+                matched = rule
+        return matched
+
+    @staticmethod
+    def is_urgent(message: str) -> bool:
+        """Check if message asks for immediate handling."""
+        return URGENT_PATTERN.search(message) is not None
@@ -1,83 +1,142 @@
 """Agent registry for dynamic agent discovery and management."""
 
 import asyncio
+import os
+from collections import defaultdict
+from functools import lru_cache
 import yaml
 import structlog
-from typing import Dict, List, Optional
-from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
 from src.agents.base_agent import AgentMetadata, AgentStatus
 from src.agents.agent_client import AgentClient
 
 logger = structlog.get_logger()
 
+# libyaml's C loader when available, otherwise the pure-Python one
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _parse_config(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse an agents config file; cached until the file's mtime changes."""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
 
 class AgentRegistry:
     """Registry for managing and discovering agents."""
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: Optional[str], health_check_concurrency: int = 16):
         self.config_path = config_path
+        self.health_check_concurrency = health_check_concurrency
         self.agents: Dict[str, AgentClient] = {}
         self.agents_by_domain: Dict[str, List[str]] = {}
-        self.agents_by_capability: Dict[str, List[str]] = {}
-
-    async def load_agents(self):
-        """Load agents from configuration file."""
+        self.agents_by_capability: Dict[str, List[str]] = defaultdict(list)
+        # Agent names per status, kept in sync by the agents through _set_status
+        self.agents_by_status: Dict[AgentStatus, Set[str]] = defaultdict(set)
+        # Bumped whenever agents are registered or change status, so callers
+        # can cache values derived from the registry
+        self.version = 0
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], **kwargs) -> "AgentRegistry":
+        """
+        Build a registry from an already parsed configuration.
+
+        Args:
+            config: Configuration in the agents config file's layout
+            **kwargs: Other AgentRegistry arguments
+
+        Returns:
+            Registry with the configured agents registered
+        """
+        registry = cls(config_path=None, **kwargs)
+        registry._register_agents(config)
+        return registry
+
+    async def load_agents(self, check_health: bool = False):
+        """
+        Load agents from configuration file.
+
+        Args:
+            check_health: Probe all loaded agents concurrently before returning
+        """
         try:
-            with open(self.config_path, "r") as f:
-                config = yaml.safe_load(f)
-
-            agents_config = config.get("agents", {})
-
-            for domain, agents in agents_config.items():
-                self.agents_by_domain[domain] = []
-
-                for agent_name, agent_config in agents.items():
-                    metadata = AgentMetadata(
-                        name=agent_name,
-                        domain=domain,
-                        url=agent_config["url"],
-                        capabilities=agent_config["capabilities"],
-                        description=agent_config["description"],
-                        health_check_endpoint=agent_config.get(
-                            "health_check_endpoint", "/health"
-                        ),
-                        timeout=agent_config.get("timeout", 30),
-                        retry_count=agent_config.get("retry_count", 3),
-                    )
-
-                    agent_client = AgentClient(metadata)
-                    self.agents[agent_name] = agent_client
-                    self.agents_by_domain[domain].append(agent_name)
-
-                    # Index by capabilities
-                    for capability in metadata.capabilities:
-                        if capability not in self.agents_by_capability:
-                            self.agents_by_capability[capability] = []
-                        self.agents_by_capability[capability].append(agent_name)
-
-                    logger.info(
-                        "agent_registered",
-                        agent=agent_name,
-                        domain=domain,
-                        capabilities=metadata.capabilities,
-                    )
-
-            logger.info(
-                "agents_loaded",
-                total_agents=len(self.agents),
-                domains=list(self.agents_by_domain.keys()),
+            config = _parse_config(
+                self.config_path, os.path.getmtime(self.config_path)
             )
+            self._register_agents(config)
 
         except Exception as e:
             logger.error("failed_to_load_agents", error=str(e))
             raise
 
+        if check_health:
+            await self.health_check_all()
+
+    def _register_agents(self, config: Dict[str, Any]):
+        """Register the agents of a parsed configuration."""
+        agents_config = config.get("agents", {})
+
+        # A reload replaces the registered agents, so every index is rebuilt
+        self.agents.clear()
+        self.agents_by_domain.clear()
+        self.agents_by_capability.clear()
+        self.agents_by_status.clear()
+
+        for domain, agents in agents_config.items():
+            self.agents_by_domain[domain] = []
+
+            for agent_name, agent_config in agents.items():
+                metadata = AgentMetadata(
+                    name=agent_name,
+                    domain=domain,
+                    url=agent_config["url"],
+                    capabilities=agent_config["capabilities"],
+                    description=agent_config["description"],
+                    health_check_endpoint=agent_config.get(
+                        "health_check_endpoint", "/health"
+                    ),
+                    timeout=agent_config.get("timeout", 30),
+                    retry_count=agent_config.get("retry_count", 3),
+                )
+
+                agent_client = AgentClient(metadata, on_status_change=self._set_status)
+                self.agents[agent_name] = agent_client
+                self.agents_by_domain[domain].append(agent_name)
+                self.agents_by_status[metadata.status].add(agent_name)
+
+                # Index by capabilities
+                for capability in metadata.capabilities:
+                    self.agents_by_capability[capability].append(agent_name)
+
+                logger.info(
+                    "agent_registered",
+                    agent=agent_name,
+                    domain=domain,
+                    capabilities=metadata.capabilities,
+                )
+
+        self.version += 1
+
+        logger.info(
+            "agents_loaded",
+            total_agents=len(self.agents),
+            domains=list(self.agents_by_domain.keys()),
+        )
+
     async def health_check_all(self):
-        """Perform health checks on all agents."""
+        """Perform health checks on all agents with bounded concurrency."""
+        semaphore = asyncio.Semaphore(self.health_check_concurrency)
+
+        async def bounded_check(agent_name: str, agent: AgentClient) -> bool:
+            async with semaphore:
+                return await self._check_agent_health(agent_name, agent)
+
         tasks = []
         for agent_name, agent in self.agents.items():
-            tasks.append(self._check_agent_health(agent_name, agent))
+            tasks.append(bounded_check(agent_name, agent))
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -89,6 +148,13 @@ class AgentRegistry:
             unhealthy=len(self.agents) - healthy_count,
         )
 
+    async def check_agent_health(self, agent_name: str) -> bool:
+        """Check health of a single registered agent by name."""
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            return False
+        return await self._check_agent_health(agent_name, agent)
+
     async def _check_agent_health(self, agent_name: str, agent: AgentClient) -> bool:
         """Check health of a single agent."""
         try:
@@ -101,6 +167,16 @@ class AgentRegistry:
             )
             return False
 
+    def _set_status(self, agent_name: str, status: AgentStatus):
+        """Move an agent into the status index for its current status."""
+        if agent_name in self.agents_by_status[status]:
+            return
+
+        for names in self.agents_by_status.values():
+            names.discard(agent_name)
+        self.agents_by_status[status].add(agent_name)
+        self.version += 1
+
     def get_agent(self, agent_name: str) -> Optional[AgentClient]:
         """Get agent by name."""
         return self.agents.get(agent_name)
@@ -120,12 +196,9 @@ class AgentRegistry:
         return list(self.agents.values())
 
     def get_healthy_agents(self) -> List[AgentClient]:
-        """Get all healthy agents."""
-        return [
-            agent
-            for agent in self.agents.values()
-            if agent.metadata.status == AgentStatus.HEALTHY
-        ]
+        """Get all healthy agents, in registration order."""
+        healthy = self.agents_by_status[AgentStatus.HEALTHY]
+        return [agent for name, agent in self.agents.items() if name in healthy]
 
     def get_agent_metadata(self, agent_name: str) -> Optional[AgentMetadata]:
         """Get metadata for an agent."""
@@ -142,10 +215,9 @@ class AgentRegistry:
 
     def get_registry_stats(self) -> Dict:
         """Get registry statistics."""
-        status_counts = {}
-        for agent in self.agents.values():
-            status = agent.metadata.status
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = {
+            status: len(names) for status, names in self.agents_by_status.items() if names
+        }
 
         return {
             "total_agents": len(self.agents),
@@ -0,0 +1,61 @@
+"""Short-lived cache of routed responses for repeated requests."""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ResponseCache:
+    """
+    Redis cache of final responses keyed by user, session, message and context.
+
+    Messages are compared after lowercasing and collapsing whitespace only;
+    identifiers are kept, since two flights or bags never share an answer.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int = 300):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: str, session_id: str, message: str, context: Dict[str, Any]) -> str:
+        normalized = " ".join(message.lower().split())
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(normalized.encode())
+        digest.update(orjson.dumps(context, option=orjson.OPT_SORT_KEYS))
+        return f"response:{user_id}:{session_id}:{digest.hexdigest()}"
+
+    async def get(
+        self, user_id: str, session_id: str, message: str, context: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Get the cached response for a request, or None."""
+        try:
+            cached = await self.redis.get(self._key(user_id, session_id, message, context))
+        except Exception as e:
+            logger.warning("response_cache_get_error", error=str(e))
+            return None
+
+        return orjson.loads(cached) if cached is not None else None
+
+    async def put(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        context: Dict[str, Any],
+        response: Dict[str, Any],
+    ):
+        """Cache a response for ttl seconds."""
+        try:
+            await self.redis.set(
+                self._key(user_id, session_id, message, context),
+                orjson.dumps(response),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            logger.warning("response_cache_put_error", error=str(e))
@@ -1,39 +1,205 @@
 """Request router with LangGraph orchestration and LLM-based intent classification."""
 
 import asyncio
+import heapq
+import itertools
 import random
 import time
-from enum import Enum
+import uuid
+from enum import StrEnum
+from functools import lru_cache
 import structlog
-from typing import Any, Dict, List, Optional, TypedDict, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, TypedDict, Tuple
 from langchain_anthropic import ChatAnthropic
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
-import json
-import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+import orjson
 
 from src.orchestrator.registry import AgentRegistry
 from src.orchestrator.context_manager import ContextManager
-from src.agents.base_agent import AgentRequest, AgentResponse
+from src.orchestrator.intent_cache import IntentCache
+from src.orchestrator.intent_classifier import IntentClassifier
+from src.orchestrator.response_cache import ResponseCache
+from src.agents.base_agent import AgentRequest, AgentResponse, AgentStatus
 from src.monitoring.metrics import MetricsCollector
 
 logger = structlog.get_logger()
 
+INTENT_SYSTEM_TEMPLATE = """You are an expert airline operations AI assistant. Analyze the incoming query and classify it precisely.
 
-class ExecutionMode(str, Enum):
+Available domains: {domains}
+Available capabilities: {capabilities}
+
+Available agents:
+{agents_info}
+
+Analyze this airline operations query and return a JSON object matching this schema:
+{schema}
+
+Guidelines:
+- "urgency": Set to "high" for time-sensitive issues (missing connections, urgent baggage issues), "medium" for standard requests, "low" for analytics/reporting
+- "multi_agent": Set to true if multiple agents needed to fully answer the query
+- "execution_mode":
+  * "sequential" - when agents need to build on each other's results (e.g., track baggage → assess risk → plan recovery)
+  * "parallel" - when agents can work independently and results aggregated (e.g., analytics from multiple sources)
+  * "conditional" - when next agent depends on previous agent's results
+
+Examples:
+
+Query: "Where is bag NH459 and what's the risk it will miss the connection?"
+Response: {{
+  "domain": "baggage_operations",
+  "intent": "track baggage and assess connection risk",
+  "required_capabilities": ["track", "locate", "risk_analysis", "connections"],
+  "urgency": "high",
+  "multi_agent": true,
+  "execution_mode": "sequential",
+  "reasoning": "Need to first locate bag, then assess risk with that location data, then evaluate connection protection"
+}}
+
+Query: "Validate crew member pay for trip 2847"
+Response: {{
+  "domain": "crew_operations",
+  "intent": "validate crew pay",
+  "required_capabilities": ["pay_validation"],
+  "urgency": "medium",
+  "multi_agent": false,
+  "execution_mode": "sequential",
+  "reasoning": "Single agent can handle pay validation"
+}}
+
+Query: "What's causing high baggage mishandling on route PTY-MIA?"
+Response: {{
+  "domain": "baggage_operations",
+  "intent": "analyze baggage mishandling root causes",
+  "required_capabilities": ["analytics", "exceptions"],
+  "urgency": "low",
+  "multi_agent": true,
+  "execution_mode": "parallel",
+  "reasoning": "Analytics and exception data can be gathered in parallel then combined"
+}}
+
+Now analyze the user's query."""
+
+# Decorrelated-jitter retry backoff bounds, in seconds
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 30.0
+
+# Human turn used when several queued queries are classified in one call
+BATCH_HUMAN_TEMPLATE = """Classify each of the following numbered queries independently.
+Return a JSON array with one classification object per query, in the same order.
+
+{message}"""
+
+
+class ExecutionMode(StrEnum):
     """Agent execution modes."""
     SEQUENTIAL = "sequential"
     PARALLEL = "parallel"
     CONDITIONAL = "conditional"
 
 
-class UrgencyLevel(str, Enum):
+class UrgencyLevel(StrEnum):
     """Request urgency levels."""
     HIGH = "high"
     MEDIUM = "medium"
     LOW = "low"
 
 
+# Wall-clock budget for a parallel fan-out, in seconds, by request urgency
+URGENCY_BUDGET = {
+    UrgencyLevel.HIGH: 2.0,
+    UrgencyLevel.MEDIUM: 5.0,
+    UrgencyLevel.LOW: 15.0,
+}
+
+
+class Classification(BaseModel):
+    """Intent classification returned by the LLM."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    domain: str = Field("baggage_operations", description="One of the available domains")
+    intent: str = Field("", description="Brief description of what the user wants")
+    required_capabilities: List[str] = Field(
+        [], description="Capabilities needed, from the available capabilities"
+    )
+    urgency: UrgencyLevel = UrgencyLevel.MEDIUM
+    multi_agent: bool = Field(False, description="Whether multiple agents are needed")
+    execution_mode: ExecutionMode = ExecutionMode.SEQUENTIAL
+    reasoning: str = Field("", description="Brief explanation of the routing decision")
+
+
+# Output contract shown to the model, generated from the model that validates replies
+CLASSIFICATION_SCHEMA = orjson.dumps(
+    Classification.model_json_schema(), option=orjson.OPT_INDENT_2
+).decode()
+
+_classification_list = TypeAdapter(List[Classification])
+
+
+class PartialAggregator:
+    """
+    Combines agent responses incrementally, as each agent finishes.
+
+    Chained (sequential and conditional) results are narrated in order,
+    parallel results are listed as they arrive.
+    """
+
+    def __init__(self, chained: bool):
+        self.chained = chained
+        self.successful: List[AgentResponse] = []
+        self.agent_names: List[str] = []
+        self.errors: List[str] = []
+        self.aggregated_data: Dict[str, Any] = {}
+        self.message_parts: List[str] = []
+
+    def add(self, response: AgentResponse):
+        """Fold one agent response into the partial result."""
+        if not response.success:
+            if response.error:
+                self.errors.append(response.error)
+            return
+
+        self.successful.append(response)
+        self.agent_names.append(response.agent_name)
+        if response.data:
+            self.aggregated_data[response.agent_name] = response.data
+        if response.message:
+            if self.chained:
+                self.message_parts.append(f"{response.agent_name}: {response.message}")
+            else:
+                self.message_parts.append(f"• {response.agent_name}: {response.message}")
+
+    def result(self) -> Dict[str, Any]:
+        """Aggregated message, data and contributing agents so far."""
+        if not self.successful:
+            return {}
+
+        if self.chained:
+            # The final message should synthesize the chain
+            if self.message_parts:
+                final_message = " → ".join(self.message_parts)
+            else:
+                final_message = self.successful[-1].message or "Request processed successfully"
+            return {
+                "message": final_message,
+                "data": self.aggregated_data,
+                "execution_chain": self.agent_names,
+            }
+
+        if self.message_parts:
+            final_message = "Combined results:\n" + "\n".join(self.message_parts)
+        else:
+            final_message = f"Data collected from {len(self.successful)} agents"
+        return {
+            "message": final_message,
+            "data": self.aggregated_data,
+            "agents_contributed": self.agent_names,
+        }
+
+
 class RouterState(TypedDict):
     """State for the router graph."""
     session_id: str
@@ -51,6 +217,47 @@ class RouterState(TypedDict):
     multi_agent: bool
     retry_count: int
     fallback_attempted: bool
+    persist_tasks: List[asyncio.Task]
+    turn_id: Optional[uuid.UUID]
+    aggregator: Optional[PartialAggregator]
+    log: Any  # structlog logger bound to the request's session and user
+
+
+def _router_node(method_name: str):
+    """Graph node that runs the named method of the router passed in the run config."""
+    async def node(state: RouterState, config: RunnableConfig) -> RouterState:
+        router = config["configurable"]["router"]
+        return await getattr(router, method_name)(state)
+
+    node.__name__ = method_name
+    return node
+
+
+# Router methods run in order for every request, as graph nodes or directly
+ROUTER_PIPELINE = (
+    ("classify_intent", "_classify_intent"),
+    ("select_agents", "_select_agents"),
+    ("execute_agents", "_execute_agents"),
+    ("aggregate_responses", "_aggregate_responses"),
+)
+
+
+@lru_cache(maxsize=1)
+def _compile_router_graph():
+    """Build and compile the LangGraph workflow, shared by all routers."""
+    workflow = StateGraph(RouterState)
+
+    # Add nodes
+    for node_name, method_name in ROUTER_PIPELINE:
+        workflow.add_node(node_name, _router_node(method_name))
+
+    # Add edges
+    workflow.set_entry_point(ROUTER_PIPELINE[0][0])
+    for (node_name, _), (next_node, _) in zip(ROUTER_PIPELINE, ROUTER_PIPELINE[1:]):
+        workflow.add_edge(node_name, next_node)
+    workflow.add_edge(ROUTER_PIPELINE[-1][0], END)
+
+    return workflow.compile()
 
 
 class RequestRouter:
@@ -64,6 +271,12 @@ class RequestRouter:
         model: str = "claude-3-5-sonnet-20241022",
         max_retries: int = 3,
         circuit_breaker_threshold: int = 3,
+        classify_batch_size: int = 8,
+        classify_batch_window: float = 0.02,
+        intent_cache_size: int = 4096,
+        intent_classifier: Optional[IntentClassifier] = None,
+        response_cache: Optional[ResponseCache] = None,
+        use_graph: bool = False,
     ):
         self.registry = registry
         self.context_manager = context_manager
@@ -75,27 +288,59 @@ class RequestRouter:
         self.max_retries = max_retries
         self.circuit_breaker_threshold = circuit_breaker_threshold
         self.agent_failure_counts: Dict[str, int] = {}
+        # Agents whose failure count has reached the threshold; updated on transitions
+        self._open_breakers: Set[str] = set()
         self.agent_load_counter: Dict[str, int] = {}
-        self.graph = self._build_graph()
-
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow."""
-        workflow = StateGraph(RouterState)
-
-        # Add nodes
-        workflow.add_node("classify_intent", self._classify_intent)
-        workflow.add_node("select_agents", self._select_agents)
-        workflow.add_node("execute_agents", self._execute_agents)
-        workflow.add_node("aggregate_responses", self._aggregate_responses)
-
-        # Add edges
-        workflow.set_entry_point("classify_intent")
-        workflow.add_edge("classify_intent", "select_agents")
-        workflow.add_edge("select_agents", "execute_agents")
-        workflow.add_edge("execute_agents", "aggregate_responses")
-        workflow.add_edge("aggregate_responses", END)
-
-        return workflow.compile()
+        # Min-heaps of (load, tiebreak, agent) per candidate set; entries are
+        # refreshed lazily when an agent's load moved since it was pushed
+        self._load_heaps: Dict[Tuple[str, ...], List[Tuple[int, int, str]]] = {}
+        self._load_tiebreak = itertools.count()
+        self.classify_batch_size = classify_batch_size
+        self.classify_batch_window = classify_batch_window
+        self._classify_queue: asyncio.Queue = asyncio.Queue()
+        self._classify_worker_task: Optional[asyncio.Task] = None
+        self.intent_cache = IntentCache(max_entries=intent_cache_size)
+        # Unambiguous single-capability requests are classified without the LLM
+        self.intent_classifier = intent_classifier or IntentClassifier()
+        self.fast_path_classifications = 0
+        # Repeated requests are answered from here when set
+        self.response_cache = response_cache
+        # Background writes recording cache hits, awaited by close()
+        self._cached_turn_tasks: Set[asyncio.Task] = set()
+        # The system prompt is sent as a cache_control block through the
+        # model's request parameters (see _refresh_prompt_cache), so the chains
+        # only carry the query. The assistant turn is prefilled with the opening
+        # bracket so the model answers with bare JSON rather than prose or
+        # markdown fences.
+        self._intent_chain = ChatPromptTemplate.from_messages([
+            ("human", "{message}"),
+            ("ai", "{{"),
+        ]) | self.llm
+        self._batch_intent_chain = ChatPromptTemplate.from_messages([
+            ("human", BATCH_HUMAN_TEMPLATE),
+            ("ai", "["),
+        ]) | self.llm
+        # Registry-derived system prompt, rebuilt when registry.version changes
+        self._prompt_cache_version = -1
+        self._system_prompt = ""
+        self._intent_cache_scope: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        # Routing indexes derived from the registry, rebuilt when registry.version changes
+        self._index_version = -1
+        self._agent_caps: Dict[str, FrozenSet[str]] = {}
+        # Capabilities offered within a single domain -> that domain
+        self._capability_domains: Dict[str, str] = {}
+        self._healthy_agents: List[str] = []
+        # Capability or domain -> healthy agents offering it, in registry order
+        self._healthy_by_capability: Dict[str, List[str]] = {}
+        self._healthy_by_domain: Dict[str, List[str]] = {}
+        # Capability token -> bit position, and per-agent (capability, token
+        # bitmask, token count) for semantic matching
+        self._token_bits: Dict[str, int] = {}
+        self._agent_cap_masks: Dict[str, List[Tuple[str, int, int]]] = {}
+        self.graph = _compile_router_graph()
+        # The workflow is linear, so by default its steps are awaited directly
+        # rather than scheduled through LangGraph
+        self.use_graph = use_graph
 
     async def route_request(
         self,
@@ -121,30 +366,66 @@ class RequestRouter:
             "multi_agent": False,
             "retry_count": 0,
             "fallback_attempted": False,
+            "persist_tasks": [],
+            "turn_id": None,
+            "aggregator": None,
+            "log": logger.bind(session_id=session_id, user_id=user_id),
         }
+        log = initial_state["log"]
 
-        routing_start_time = time.time()
+        routing_start_time = time.perf_counter()
+
+        if self.response_cache is not None:
+            cached = await self.response_cache.get(
+                user_id, session_id, message, initial_state["context"]
+            )
+            if cached is not None:
+                log.info("response_cache_hit")
+                # The cached answer is returned without waiting for the turn to be saved
+                task = asyncio.create_task(self._persist_cached_response(initial_state, cached))
+                self._cached_turn_tasks.add(task)
+                task.add_done_callback(self._cached_turn_tasks.discard)
+                return cached
 
         try:
-            result = await self.graph.ainvoke(initial_state)
+            try:
+                if self.use_graph:
+                    result = await self.graph.ainvoke(
+                        initial_state, config={"configurable": {"router": self}}
+                    )
+                else:
+                    result = await self._run_pipeline(initial_state)
+            finally:
+                # Conversation and session writes run in the background while
+                # agents execute; make sure they have landed before returning
+                await asyncio.gather(*initial_state["persist_tasks"], return_exceptions=True)
 
-            routing_duration = (time.time() - routing_start_time) * 1000
+            routing_duration = (time.perf_counter() - routing_start_time) * 1000
 
-            logger.info(
+            log.info(
                 "routing_complete",
-                session_id=session_id,
                 agents_used=result.get("selected_agents", []),
                 execution_mode=result.get("execution_mode"),
                 urgency=result.get("urgency"),
                 duration_ms=routing_duration,
             )
 
-            return result.get("final_response", {})
+            final_response = result.get("final_response", {})
+            if self.response_cache is not None and final_response.get("success"):
+                await self.response_cache.put(
+                    user_id, session_id, message, initial_state["context"], final_response
+                )
+
+            return final_response
+
+        except asyncio.CancelledError:
+            # The caller went away; in-flight agent calls were cancelled with us
+            log.info("routing_cancelled")
+            raise
 
         except Exception as e:
-            logger.error(
+            log.error(
                 "routing_error",
-                session_id=session_id,
                 error=str(e),
             )
             return {
@@ -153,135 +434,49 @@ class RequestRouter:
                 "message": "Failed to process request",
             }
 
+    async def _run_pipeline(self, state: RouterState) -> RouterState:
+        """Run the workflow steps in order without the graph scheduler."""
+        for _, method_name in ROUTER_PIPELINE:
+            state = await getattr(self, method_name)(state)
+        return state
+
     async def _classify_intent(self, state: RouterState) -> RouterState:
         """Classify user intent and determine domain with enhanced analysis."""
-        logger.info("classifying_intent", session_id=state["session_id"])
-
-        # Get available domains and capabilities
-        domains = self.registry.list_domains()
-        capabilities = self.registry.list_capabilities()
-
-        # Get agent registry info for better context
-        agents_info = []
-        for agent in self.registry.get_all_agents():
-            agents_info.append({
-                "name": agent.metadata.name,
-                "domain": agent.metadata.domain,
-                "capabilities": agent.metadata.capabilities,
-                "description": agent.metadata.description,
-            })
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert airline operations AI assistant. Analyze the incoming query and classify it precisely.
-
-Available domains: {domains}
-Available capabilities: {capabilities}
-
-Available agents:
-{agents_info}
-
-Analyze this airline operations query and return JSON with the following structure:
-{{
-  "domain": "baggage_operations|crew_operations|flight_ops",
-  "intent": "brief description of what user wants",
-  "required_capabilities": ["capability1", "capability2"],
-  "urgency": "high|medium|low",
-  "multi_agent": true|false,
-  "execution_mode": "sequential|parallel|conditional",
-  "reasoning": "brief explanation of routing decision"
-}}
-
-Guidelines:
-- "urgency": Set to "high" for time-sensitive issues (missing connections, urgent baggage issues), "medium" for standard requests, "low" for analytics/reporting
-- "multi_agent": Set to true if multiple agents needed to fully answer the query
-- "execution_mode":
-  * "sequential" - when agents need to build on each other's results (e.g., track baggage → assess risk → plan recovery)
-  * "parallel" - when agents can work independently and results aggregated (e.g., analytics from multiple sources)
-  * "conditional" - when next agent depends on previous agent's results
-
-Examples:
-
-Query: "Where is bag NH459 and what's the risk it will miss the connection?"
-Response: {{
-  "domain": "baggage_operations",
-  "intent": "track baggage and assess connection risk",
-  "required_capabilities": ["track", "locate", "risk_analysis", "connections"],
-  "urgency": "high",
-  "multi_agent": true,
-  "execution_mode": "sequential",
-  "reasoning": "Need to first locate bag, then assess risk with that location data, then evaluate connection protection"
-}}
-
-Query: "Validate crew member pay for trip 2847"
-Response: {{
-  "domain": "crew_operations",
-  "intent": "validate crew pay",
-  "required_capabilities": ["pay_validation"],
-  "urgency": "medium",
-  "multi_agent": false,
-  "execution_mode": "sequential",
-  "reasoning": "Single agent can handle pay validation"
-}}
-
-Query: "What's causing high baggage mishandling on route PTY-MIA?"
-Response: {{
-  "domain": "baggage_operations",
-  "intent": "analyze baggage mishandling root causes",
-  "required_capabilities": ["analytics", "exceptions"],
-  "urgency": "low",
-  "multi_agent": true,
-  "execution_mode": "parallel",
-  "reasoning": "Analytics and exception data can be gathered in parallel then combined"
-}}
-
-Now analyze the user's query."""),
-            ("human", "{message}"),
-        ])
+        log = state["log"]
+        log.debug("classifying_intent")
 
         try:
-            chain = prompt | self.llm
-            response = await chain.ainvoke({
-                "message": state["message"],
-                "domains": ", ".join(domains),
-                "capabilities": ", ".join(capabilities),
-                "agents_info": json.dumps(agents_info, indent=2),
-            })
-
-            # Parse LLM response
-            content = response.content
-            # Extract JSON from response
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = content.strip()
-
-            classification = json.loads(json_str)
-
-            state["domain"] = classification.get("domain", "baggage_operations")
-            state["intent"] = classification.get("intent", "")
-            state["capabilities_needed"] = classification.get("required_capabilities", [])
-            state["urgency"] = classification.get("urgency", "medium")
-            state["multi_agent"] = classification.get("multi_agent", False)
-            state["execution_mode"] = classification.get("execution_mode", "sequential")
-
-            logger.info(
+            classification = self._fast_classify(state["message"])
+            if classification is None:
+                self._refresh_prompt_cache()
+                # Cached classifications are only valid for the same domains and capabilities
+                cache_scope = self._intent_cache_scope
+                classification = self.intent_cache.get(state["message"], cache_scope)
+                if classification is None:
+                    classification = await self._enqueue_classification(state["message"])
+                    self.intent_cache.put(state["message"], cache_scope, classification)
+
+            state["domain"] = classification.domain
+            state["intent"] = classification.intent
+            state["capabilities_needed"] = list(classification.required_capabilities)
+            state["urgency"] = classification.urgency
+            state["multi_agent"] = classification.multi_agent
+            state["execution_mode"] = classification.execution_mode
+
+            log.info(
                 "intent_classified",
-                session_id=state["session_id"],
                 domain=state["domain"],
                 intent=state["intent"],
                 capabilities=state["capabilities_needed"],
                 urgency=state["urgency"],
                 multi_agent=state["multi_agent"],
                 execution_mode=state["execution_mode"],
-                reasoning=classification.get("reasoning", ""),
+                reasoning=classification.reasoning,
             )
 
         except Exception as e:
-            logger.error(
+            log.error(
                 "intent_classification_error",
-                session_id=state["session_id"],
                 error=str(e),
             )
             # Fallback to default classification
@@ -293,35 +488,263 @@ Now analyze the user's query."""),
 
         return state
 
+    def _fast_classify(self, message: str) -> Optional[Classification]:
+        """Classify message without the LLM, or None if the LLM is needed."""
+        self._refresh_indexes()
+        urgency = (
+            UrgencyLevel.HIGH if self.intent_classifier.is_urgent(message)
+            else UrgencyLevel.MEDIUM
+        )
+
+        # With a single registered agent there is only one possible routing
+        if len(self._agent_caps) == 1:
+            (agent,) = self.registry.get_all_agents()
+            self.fast_path_classifications += 1
+            return Classification(
+                domain=agent.metadata.domain,
+                intent=agent.metadata.description,
+                required_capabilities=agent.metadata.capabilities,
+                urgency=urgency,
+                reasoning="Only one agent is registered",
+            )
+
+        rule = self.intent_classifier.classify(message)
+        if rule is None:
+            return None
+
+        domain = self._capability_domains.get(rule.capability)
+        if domain is None:
+            return None
+
+        self.fast_path_classifications += 1
+        return Classification(
+            domain=domain,
+            intent=rule.intent,
+            required_capabilities=[rule.capability],
+            urgency=urgency,
+            reasoning="Matched keyword rule",
+        )
+
+    async def _enqueue_classification(self, message: str) -> Classification:
+        """Queue a message for the batching classifier and wait for its result."""
+        if self._classify_worker_task is None or self._classify_worker_task.done():
+            self._classify_worker_task = asyncio.create_task(self._classify_worker())
+
+        future = asyncio.get_running_loop().create_future()
+        self._classify_queue.put_nowait((message, future))
+        return await future
+
+    async def _classify_worker(self):
+        """
+        Coalesce concurrent classification requests into batched LLM calls.
+
+        Waits up to classify_batch_window after the first queued message, or
+        until classify_batch_size messages are queued, then classifies the
+        whole batch with a single LLM call.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._classify_queue.get()]
+            deadline = loop.time() + self.classify_batch_window
+
+            while len(batch) < self.classify_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._classify_queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            messages = [message for message, _ in batch]
+            try:
+                classifications = await self._classify_messages(messages)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), classification in zip(batch, classifications):
+                if not future.done():
+                    future.set_result(classification)
+
+    def _refresh_prompt_cache(self):
+        """Rebuild the registry-derived system prompt if the registry has changed."""
+        if self.registry.version == self._prompt_cache_version:
+            return
+        self._prompt_cache_version = self.registry.version
+
+        # Sorted so the prompt prefix is byte-stable across reloads, which
+        # Anthropic's prompt cache and the intent cache scope both key on
+        domains = tuple(sorted(self.registry.list_domains()))
+        capabilities = tuple(sorted(self.registry.list_capabilities()))
+        agents_info = sorted(
+            (
+                {
+                    "name": agent.metadata.name,
+                    "domain": agent.metadata.domain,
+                    "capabilities": agent.metadata.capabilities,
+                    "description": agent.metadata.description,
+                }
+                for agent in self.registry.get_all_agents()
+            ),
+            key=lambda info: info["name"],
+        )
+
+        system_prompt = INTENT_SYSTEM_TEMPLATE.format(
+            schema=CLASSIFICATION_SCHEMA,
+            domains=", ".join(domains),
+            capabilities=", ".join(capabilities),
+            agents_info=orjson.dumps(agents_info, option=orjson.OPT_INDENT_2).decode(),
+        )
+        # Health changes bump the registry version without changing the prompt
+        if system_prompt == self._system_prompt:
+            return
+
+        self._system_prompt = system_prompt
+        # Model kwargs are merged into the Messages API request after the
+        # prompt's own fields, so this replaces the plain-text system prompt
+        # with a block Anthropic caches as a prompt prefix between calls
+        self.llm.model_kwargs["system"] = [{
+            "type": "text",
+            "text": self._system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }]
+        self._intent_cache_scope = (domains, capabilities)
+
+    async def _classify_messages(self, messages: List[str]) -> List[Classification]:
+        """Classify one or more messages with a single LLM call."""
+        self._refresh_prompt_cache()
+
+        if len(messages) == 1:
+            chain = self._intent_chain
+            message_input = messages[0]
+        else:
+            chain = self._batch_intent_chain
+            message_input = "\n".join(
+                f"{i}. {message}" for i, message in enumerate(messages, start=1)
+            )
+
+        response = await chain.ainvoke({"message": message_input})
+
+        if len(messages) == 1:
+            return [Classification.model_validate_json("{" + response.content)]
+
+        classifications = _classification_list.validate_json("[" + response.content)
+        if len(classifications) != len(messages):
+            raise ValueError(
+                f"Expected {len(messages)} classifications, got {len(classifications)}"
+            )
+
+        logger.info("intent_batch_classified", batch_size=len(messages))
+        return classifications
+
+    @staticmethod
+    def _capability_tokens(capability: str) -> FrozenSet[str]:
+        """Lowercased word tokens of a snake_case capability name."""
+        return frozenset(capability.lower().split("_"))
+
+    def _capability_mask(self, tokens: FrozenSet[str]) -> int:
+        """Bitmask of the tokens known to the registry; unknown tokens never overlap."""
+        mask = 0
+        for token in tokens:
+            bit = self._token_bits.get(token)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _refresh_indexes(self):
+        """Rebuild capability, health and token indexes if the registry has changed."""
+        if self.registry.version == self._index_version:
+            return
+
+        healthy = self.registry.agents_by_status.get(AgentStatus.HEALTHY, set())
+        agents = self.registry.get_all_agents()
+
+        self._agent_caps = {
+            agent.metadata.name: frozenset(agent.metadata.capabilities) for agent in agents
+        }
+        capability_domains: Dict[str, Set[str]] = {}
+        for agent in agents:
+            for capability in agent.metadata.capabilities:
+                capability_domains.setdefault(capability, set()).add(agent.metadata.domain)
+        self._capability_domains = {
+            capability: next(iter(domains))
+            for capability, domains in capability_domains.items()
+            if len(domains) == 1
+        }
+        # Registry order is kept so load-balancing ties resolve deterministically
+        self._healthy_agents = []
+        healthy_by_capability: Dict[str, List[str]] = {}
+        healthy_by_domain: Dict[str, List[str]] = {}
+        for agent in agents:
+            agent_name = agent.metadata.name
+            if agent_name not in healthy:
+                continue
+            self._healthy_agents.append(agent_name)
+            healthy_by_domain.setdefault(agent.metadata.domain, []).append(agent_name)
+            for capability in self._agent_caps[agent_name]:
+                healthy_by_capability.setdefault(capability, []).append(agent_name)
+        self._healthy_by_capability = healthy_by_capability
+        self._healthy_by_domain = healthy_by_domain
+
+        token_bits: Dict[str, int] = {}
+        cap_masks = {}
+        for agent in agents:
+            entries = []
+            for agent_cap in agent.metadata.capabilities:
+                tokens = self._capability_tokens(agent_cap)
+                mask = 0
+                for token in tokens:
+                    mask |= 1 << token_bits.setdefault(token, len(token_bits))
+                entries.append((agent_cap, mask, len(tokens)))
+            cap_masks[agent.metadata.name] = entries
+        self._token_bits = token_bits
+        self._agent_cap_masks = cap_masks
+
+        # Candidate sets change with agent health; start load heaps afresh
+        self._load_heaps.clear()
+
+        self._index_version = self.registry.version
+
+    @staticmethod
     def _calculate_semantic_similarity(
-        self, capability: str, agent_capabilities: List[str]
+        cap_mask: int,
+        cap_len: int,
+        agent_cap_masks: List[Tuple[str, int, int]],
     ) -> float:
         """
         Calculate semantic similarity between capability and agent capabilities.
-        Using simple overlap for now. Can be enhanced with embeddings.
+        Using simple token overlap (popcount of shared token bits) for now.
+        Can be enhanced with embeddings.
         """
-        if capability in agent_capabilities:
-            return 1.0
-
-        # Simple keyword matching
-        capability_words = set(capability.lower().split("_"))
         max_similarity = 0.0
 
-        for agent_cap in agent_capabilities:
-            agent_cap_words = set(agent_cap.lower().split("_"))
-            overlap = len(capability_words & agent_cap_words)
-            if overlap > 0:
-                similarity = overlap / max(len(capability_words), len(agent_cap_words))
-                max_similarity = max(max_similarity, similarity)
+        for _, agent_mask, agent_len in agent_cap_masks:
+            overlap = (cap_mask & agent_mask).bit_count()
+            if overlap:
+                similarity = overlap / max(cap_len, agent_len)
+                if similarity > max_similarity:
+                    max_similarity = similarity
 
         return max_similarity
 
     def _is_circuit_breaker_open(self, agent_name: str) -> bool:
         """Check if circuit breaker is open for an agent."""
-        failure_count = self.agent_failure_counts.get(agent_name, 0)
-        is_open = failure_count >= self.circuit_breaker_threshold
+        return agent_name in self._open_breakers
+
+    def _record_agent_failure(self, agent_name: str):
+        """Count a failure, opening the agent's circuit breaker at the threshold."""
+        failure_count = self.agent_failure_counts.get(agent_name, 0) + 1
+        self.agent_failure_counts[agent_name] = failure_count
 
-        if is_open:
+        if (failure_count >= self.circuit_breaker_threshold
+                and agent_name not in self._open_breakers):
+            self._open_breakers.add(agent_name)
             logger.warning(
                 "circuit_breaker_open",
                 agent=agent_name,
@@ -329,7 +752,10 @@ Now analyze the user's query."""),
             )
             MetricsCollector.record_circuit_breaker_failure(agent_name)
 
-        return is_open
+    def _record_agent_success(self, agent_name: str):
+        """Reset an agent's failure count and close its circuit breaker."""
+        self.agent_failure_counts[agent_name] = 0
+        self._open_breakers.discard(agent_name)
 
     def _select_agent_with_load_balancing(
         self, candidates: List[str]
@@ -345,71 +771,72 @@ Now analyze the user's query."""),
             logger.warning("no_agents_available_after_circuit_breaker_check")
             return None
 
-        # Round-robin selection
-        load_counts = [(a, self.agent_load_counter.get(a, 0)) for a in available]
-        selected = min(load_counts, key=lambda x: x[1])[0]
+        # Least-loaded selection
+        heap = self._load_heaps.get(tuple(available))
+        if heap is None:
+            heap = [
+                (self.agent_load_counter.get(a, 0), next(self._load_tiebreak), a)
+                for a in available
+            ]
+            heapq.heapify(heap)
+            self._load_heaps[tuple(available)] = heap
+
+        while True:
+            load, _, selected = heap[0]
+            current = self.agent_load_counter.get(selected, 0)
+            if load == current:
+                break
+            # Selected through another candidate set since this entry was pushed
+            heapq.heapreplace(heap, (current, next(self._load_tiebreak), selected))
 
         # Increment load counter
-        self.agent_load_counter[selected] = self.agent_load_counter.get(selected, 0) + 1
+        self.agent_load_counter[selected] = current + 1
+        heapq.heapreplace(heap, (current + 1, next(self._load_tiebreak), selected))
 
         return selected
 
     async def _select_agents(self, state: RouterState) -> RouterState:
         """Select appropriate agents based on capabilities with intelligent matching."""
-        logger.info(
-            "selecting_agents",
-            session_id=state["session_id"],
-            urgency=state["urgency"],
-        )
+        log = state["log"]
+        log.debug("selecting_agents", urgency=state["urgency"])
 
         selected_agents_map: Dict[str, List[str]] = {}  # capability -> [agents]
+        # capability -> [(agent, similarity)], logged once with the selection
+        semantic_matches: Dict[str, List[Tuple[str, float]]] = {}
         semantic_threshold = 0.7
 
-        # For each required capability, find matching agents
-        for capability in state["capabilities_needed"]:
-            candidate_agents = []
-
-            # First, try exact capability match
-            agents = self.registry.get_agents_by_capability(capability)
+        self._refresh_indexes()
 
-            for agent in agents:
-                # Only consider healthy agents
-                if agent.metadata.status.value != "healthy":
-                    continue
+        available_agents: Optional[List[str]] = None
 
-                # Check circuit breaker
-                if self._is_circuit_breaker_open(agent.metadata.name):
-                    continue
-
-                candidate_agents.append(agent.metadata.name)
+        # For each required capability, find matching agents
+        for capability in state["capabilities_needed"]:
+            candidate_agents = [
+                agent_name
+                for agent_name in self._healthy_by_capability.get(capability, ())
+                if agent_name not in self._open_breakers
+            ]
 
             # If no exact matches, try semantic matching
             if not candidate_agents:
-                logger.info(
-                    "attempting_semantic_match",
-                    capability=capability,
-                    session_id=state["session_id"],
-                )
-
-                all_agents = self.registry.get_all_agents()
-                for agent in all_agents:
-                    if agent.metadata.status.value != "healthy":
-                        continue
-
-                    if self._is_circuit_breaker_open(agent.metadata.name):
-                        continue
-
+                if available_agents is None:
+                    available_agents = [
+                        agent_name for agent_name in self._healthy_agents
+                        if agent_name not in self._open_breakers
+                    ]
+                cap_tokens = self._capability_tokens(capability)
+                cap_mask = self._capability_mask(cap_tokens)
+                cap_len = len(cap_tokens)
+
+                for agent_name in available_agents:
                     similarity = self._calculate_semantic_similarity(
-                        capability, agent.metadata.capabilities
+                        cap_mask, cap_len, self._agent_cap_masks[agent_name]
                     )
 
                     if similarity >= semantic_threshold:
-                        candidate_agents.append(agent.metadata.name)
-                        logger.info(
-                            "semantic_match_found",
-                            agent=agent.metadata.name,
-                            capability=capability,
-                            similarity=similarity,
+                        candidate_agents.append(agent_name)
+                        semantic_matches.setdefault(capability, []).append(
+                            (agent_name, similarity)
                         )
 
             # Select best agent using load balancing
@@ -425,24 +852,20 @@ Now analyze the user's query."""),
 
         # Fallback routing if no agents selected
         if not selected_agents and state["domain"]:
-            logger.warning(
+            log.warning(
                 "no_agents_found_attempting_fallback",
-                session_id=state["session_id"],
                 domain=state["domain"],
             )
 
             state["fallback_attempted"] = True
 
             # Try to get any healthy agent from the domain
-            agents = self.registry.get_agents_by_domain(state["domain"])
-            for agent in agents:
-                if (agent.metadata.status.value == "healthy" and
-                    not self._is_circuit_breaker_open(agent.metadata.name)):
-                    selected_agents.append(agent.metadata.name)
-                    logger.info(
+            for agent_name in self._healthy_by_domain.get(state["domain"], ()):
+                if agent_name not in self._open_breakers:
+                    selected_agents.append(agent_name)
+                    log.info(
                         "fallback_agent_selected",
-                        agent=agent.metadata.name,
-                        session_id=state["session_id"],
+                        agent=agent_name,
                     )
                     break
 
@@ -456,12 +879,12 @@ Now analyze the user's query."""),
         else:
             state["selected_agents"] = selected_agents
 
-        logger.info(
+        log.info(
             "agents_selected",
-            session_id=state["session_id"],
             agents=state["selected_agents"],
             execution_mode=state["execution_mode"],
             fallback_used=state["fallback_attempted"],
+            semantic_matches=semantic_matches,
         )
 
         return state
@@ -475,10 +898,9 @@ Now analyze the user's query."""),
 
         for capability in capabilities:
             for agent_name in agents:
-                agent = self.registry.get_agent(agent_name)
-                if agent and capability in agent.metadata.capabilities:
-                    if capability not in capability_to_agent:
-                        capability_to_agent[capability] = agent_name
+                if capability in self._agent_caps.get(agent_name, ()):
+                    capability_to_agent[capability] = agent_name
+                    break
 
         # Order agents based on capability order
         ordered = []
@@ -500,10 +922,13 @@ Now analyze the user's query."""),
         agent_name: str,
         request: AgentRequest,
         max_retries: Optional[int] = None,
+        log: Any = None,
     ) -> AgentResponse:
         """Execute agent with exponential backoff retry logic."""
         if max_retries is None:
             max_retries = self.max_retries
+        if log is None:
+            log = logger
 
         agent = self.registry.get_agent(agent_name)
         if not agent:
@@ -514,6 +939,7 @@ Now analyze the user's query."""),
             )
 
         last_error = None
+        backoff = RETRY_BASE_DELAY
 
         for attempt in range(max_retries + 1):
             try:
@@ -523,19 +949,16 @@ Now analyze the user's query."""),
                 # Track success/failure for circuit breaker
                 if response.success:
                     # Reset failure count on success
-                    self.agent_failure_counts[agent_name] = 0
-                    logger.info(
+                    self._record_agent_success(agent_name)
+                    log.debug(
                         "agent_execution_success",
                         agent=agent_name,
                         attempt=attempt + 1,
-                        session_id=request.session_id,
                     )
                 else:
                     # Increment failure count
-                    self.agent_failure_counts[agent_name] = (
-                        self.agent_failure_counts.get(agent_name, 0) + 1
-                    )
-                    logger.warning(
+                    self._record_agent_failure(agent_name)
+                    log.warning(
                         "agent_execution_failed",
                         agent=agent_name,
                         attempt=attempt + 1,
@@ -548,11 +971,9 @@ Now analyze the user's query."""),
                 last_error = str(e)
 
                 # Increment failure count
-                self.agent_failure_counts[agent_name] = (
-                    self.agent_failure_counts.get(agent_name, 0) + 1
-                )
+                self._record_agent_failure(agent_name)
 
-                logger.error(
+                log.error(
                     "agent_execution_exception",
                     agent=agent_name,
                     attempt=attempt + 1,
@@ -561,9 +982,15 @@ Now analyze the user's query."""),
 
                 # Don't retry on last attempt
                 if attempt < max_retries:
-                    # Exponential backoff: 2^attempt seconds
-                    wait_time = 2 ** attempt
-                    logger.info(
+                    # Decorrelated jitter spreads retries from concurrent callers;
+                    # an explicit Retry-After from the agent takes precedence
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after is not None:
+                        wait_time = min(RETRY_MAX_DELAY, float(retry_after))
+                    else:
+                        backoff = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, backoff * 3))
+                        wait_time = backoff
+                    log.info(
                         "retrying_agent_execution",
                         agent=agent_name,
                         wait_seconds=wait_time,
@@ -582,103 +1009,117 @@ Now analyze the user's query."""),
         self, state: RouterState
     ) -> List[AgentResponse]:
         """Execute agents sequentially with context passing."""
+        log = state["log"]
         responses = []
-        accumulated_context = state["context"].copy()
 
-        for agent_name in state["selected_agents"]:
-            logger.info(
-                "executing_sequential_agent",
-                agent=agent_name,
-                session_id=state["session_id"],
-            )
+        # One request is reused for the whole chain; validation gives it its own
+        # copy of the context, which then accumulates each agent's output
+        request = AgentRequest(
+            session_id=state["session_id"],
+            user_id=state["user_id"],
+            message=state["message"],
+            context=state["context"],
+        )
+        accumulated_context = request.context
+        # Session variables not yet written; the initial context goes with the first turn
+        pending_variables = dict(accumulated_context)
 
-            request = AgentRequest(
-                session_id=state["session_id"],
-                user_id=state["user_id"],
-                message=state["message"],
-                context=accumulated_context,
-            )
+        for agent_name in state["selected_agents"]:
+            log.debug("executing_sequential_agent", agent=agent_name)
 
-            response = await self._execute_agent_with_retry(agent_name, request)
+            response = await self._execute_agent_with_retry(agent_name, request, log=log)
             responses.append(response)
+            state["aggregator"].add(response)
 
             # Pass successful response data to next agent's context
             if response.success and response.data:
-                accumulated_context[f"{agent_name}_output"] = response.data
+                output_key = f"{agent_name}_output"
+                accumulated_context[output_key] = response.data
+                pending_variables[output_key] = response.data
 
-            # Save conversation
-            await self.context_manager.save_conversation(
-                session_id=state["session_id"],
-                user_id=state["user_id"],
-                agent_name=agent_name,
-                user_message=state["message"],
-                agent_response=response.message or "",
-                metadata=response.metadata,
-            )
-
-            # Update session
-            await self.context_manager.update_session(
-                state["session_id"],
-                agent_name=agent_name,
-                context_variables=accumulated_context,
-            )
+            # Save conversation and update session without blocking the next agent
+            self._schedule_persistence(state, [response], pending_variables)
+            pending_variables = {}
 
         return responses
 
     async def _execute_parallel(
         self, state: RouterState
     ) -> List[AgentResponse]:
-        """Execute agents in parallel."""
-        logger.info(
-            "executing_parallel_agents",
-            agents=state["selected_agents"],
+        """
+        Execute agents in parallel within the request's urgency budget.
+
+        Agents still running when the budget runs out are cancelled, as are
+        the remaining agents if one raises.
+        """
+        log = state["log"]
+        log.debug("executing_parallel_agents", agents=state["selected_agents"])
+
+        budget = URGENCY_BUDGET.get(state["urgency"], URGENCY_BUDGET[UrgencyLevel.MEDIUM])
+        timed_out = False
+        handles = []
+        aggregator = state["aggregator"]
+        # Parallel agents only read the request, so they all share one
+        request = AgentRequest(
             session_id=state["session_id"],
+            user_id=state["user_id"],
+            message=state["message"],
+            context=state["context"],
         )
 
-        # Create tasks for parallel execution
-        tasks = []
-        for agent_name in state["selected_agents"]:
-            request = AgentRequest(
-                session_id=state["session_id"],
-                user_id=state["user_id"],
-                message=state["message"],
-                context=state["context"],
-            )
-            tasks.append(self._execute_agent_with_retry(agent_name, request))
-
-        # Execute all in parallel
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        async def execute(agent_name: str) -> AgentResponse:
+            # Aggregate each response as soon as its agent finishes
+            response = await self._execute_agent_with_retry(agent_name, request, log=log)
+            aggregator.add(response)
+            return response
 
-        # Convert exceptions to AgentResponse
+        try:
+            async with asyncio.timeout(budget):
+                async with asyncio.TaskGroup() as tg:
+                    for agent_name in state["selected_agents"]:
+                        handles.append(tg.create_task(execute(agent_name)))
+        except* TimeoutError:
+            timed_out = True
+        except* Exception as group:
+            log.error("parallel_execution_error", error=str(group.exceptions[0]))
+
+        # Convert cancellations and exceptions to AgentResponse
         final_responses = []
-        for i, response in enumerate(responses):
-            if isinstance(response, Exception):
-                agent_name = state["selected_agents"][i]
-                final_responses.append(
-                    AgentResponse(
-                        agent_name=agent_name,
-                        success=False,
-                        error=str(response),
-                    )
+        for agent_name, handle in zip(state["selected_agents"], handles):
+            if handle.cancelled():
+                if timed_out:
+                    error = f"Agent did not respond within the {budget:g}s budget"
+                    # Repeated timeouts open the breaker like any other failure
+                    self._record_agent_failure(agent_name)
+                else:
+                    error = "Cancelled after another agent failed"
+                response = AgentResponse(agent_name=agent_name, success=False, error=error)
+                aggregator.add(response)
+            elif handle.exception() is not None:
+                response = AgentResponse(
+                    agent_name=agent_name,
+                    success=False,
+                    error=str(handle.exception()),
                 )
+                aggregator.add(response)
             else:
-                final_responses.append(response)
+                response = handle.result()
+            final_responses.append(response)
 
-        # Save conversations
-        for agent_name, response in zip(state["selected_agents"], final_responses):
-            await self.context_manager.save_conversation(
-                session_id=state["session_id"],
-                user_id=state["user_id"],
-                agent_name=agent_name,
-                user_message=state["message"],
-                agent_response=response.message or "" if hasattr(response, 'message') else "",
-                metadata=response.metadata if hasattr(response, 'metadata') else {},
+        if timed_out:
+            log.warning(
+                "parallel_execution_budget_exceeded",
+                budget_seconds=budget,
+                urgency=state["urgency"],
+                timed_out_agents=[
+                    agent_name
+                    for agent_name, handle in zip(state["selected_agents"], handles)
+                    if handle.cancelled()
+                ],
             )
 
-            await self.context_manager.update_session(
-                state["session_id"],
-                agent_name=agent_name,
-            )
+        # Save every response and record all agents in one session update
+        self._schedule_persistence(state, final_responses)
 
         return final_responses
 
@@ -686,8 +1127,18 @@ Now analyze the user's query."""),
         self, state: RouterState
     ) -> List[AgentResponse]:
         """Execute agents conditionally based on previous results."""
+        log = state["log"]
         responses = []
-        accumulated_context = state["context"].copy()
+
+        # Shared request and accumulated context, as in _execute_sequential
+        request = AgentRequest(
+            session_id=state["session_id"],
+            user_id=state["user_id"],
+            message=state["message"],
+            context=state["context"],
+        )
+        accumulated_context = request.context
+        pending_variables = dict(accumulated_context)
 
         for i, agent_name in enumerate(state["selected_agents"]):
             # Check if we should execute based on previous results
@@ -695,72 +1146,147 @@ Now analyze the user's query."""),
                 last_response = responses[-1]
                 # Only continue if previous agent succeeded
                 if not last_response.success:
-                    logger.info(
+                    log.info(
                         "skipping_conditional_agent",
                         agent=agent_name,
                         reason="previous_agent_failed",
-                        session_id=state["session_id"],
                     )
                     break
 
-            logger.info(
-                "executing_conditional_agent",
-                agent=agent_name,
-                session_id=state["session_id"],
-            )
+            log.debug("executing_conditional_agent", agent=agent_name)
 
-            request = AgentRequest(
-                session_id=state["session_id"],
-                user_id=state["user_id"],
-                message=state["message"],
-                context=accumulated_context,
-            )
-
-            response = await self._execute_agent_with_retry(agent_name, request)
+            response = await self._execute_agent_with_retry(agent_name, request, log=log)
             responses.append(response)
+            state["aggregator"].add(response)
 
             # Pass response data to next agent
             if response.success and response.data:
-                accumulated_context[f"{agent_name}_output"] = response.data
+                output_key = f"{agent_name}_output"
+                accumulated_context[output_key] = response.data
+                pending_variables[output_key] = response.data
+
+            # Save conversation and update session without blocking the next agent
+            self._schedule_persistence(state, [response], pending_variables)
+            pending_variables = {}
+
+        return responses
 
-            # Save conversation
-            await self.context_manager.save_conversation(
+    def _schedule_persistence(
+        self,
+        state: RouterState,
+        responses: List[AgentResponse],
+        context_variables: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Save agent responses and update the session in a background task.
+
+        Each task waits for the request's previous task so session updates
+        apply in agent order; route_request waits for all of them before
+        returning.
+        """
+        tasks = state["persist_tasks"]
+        previous = tasks[-1] if tasks else None
+        tasks.append(asyncio.create_task(self._persist_agent_turn(
+            previous, state, responses, context_variables
+        )))
+
+    async def _persist_agent_turn(
+        self,
+        previous: Optional[asyncio.Task],
+        state: RouterState,
+        responses: List[AgentResponse],
+        context_variables: Optional[Dict[str, Any]],
+    ):
+        """Save agent responses and update the session after the previous task."""
+        log = state["log"]
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        agent_names = [response.agent_name for response in responses]
+        try:
+            await self.context_manager.save_agent_responses(
+                turn_id=state["turn_id"],
                 session_id=state["session_id"],
                 user_id=state["user_id"],
-                agent_name=agent_name,
-                user_message=state["message"],
-                agent_response=response.message or "",
-                metadata=response.metadata,
+                responses=responses,
             )
 
             await self.context_manager.update_session(
                 state["session_id"],
-                agent_name=agent_name,
-                context_variables=accumulated_context,
+                agent_names=agent_names,
+                context_variables=context_variables,
             )
 
-        return responses
+        except Exception as e:
+            log.error(
+                "agent_turn_persistence_error",
+                agents=agent_names,
+                error=str(e),
+            )
+
+    async def _persist_cached_response(self, state: RouterState, response: Dict[str, Any]):
+        """
+        Record a turn answered from the response cache.
+
+        The cached answer is saved as one history row named "response_cache",
+        with the agents that produced it in its metadata, and those agents are
+        appended to the session's chain.
+        """
+        agent_names = response.get("agents_used", [])
+        try:
+            state["turn_id"] = await self.context_manager.begin_turn(
+                state["session_id"], state["user_id"], state["message"]
+            )
+            await self.context_manager.save_agent_responses(
+                turn_id=state["turn_id"],
+                session_id=state["session_id"],
+                user_id=state["user_id"],
+                responses=[AgentResponse(
+                    agent_name="response_cache",
+                    success=True,
+                    message=response.get("message"),
+                    metadata={"cached": True, "agents_used": agent_names},
+                )],
+            )
+            await self.context_manager.update_session(
+                state["session_id"], agent_names=agent_names
+            )
+
+        except Exception as e:
+            state["log"].error(
+                "cached_turn_persistence_error",
+                agents=agent_names,
+                error=str(e),
+            )
 
     async def _execute_agents(self, state: RouterState) -> RouterState:
         """Execute selected agents based on execution mode."""
+        log = state["log"]
         if not state["selected_agents"]:
-            logger.warning(
+            log.warning(
                 "no_agents_to_execute",
-                session_id=state["session_id"],
             )
             state["agent_responses"] = []
             return state
 
         execution_mode = state.get("execution_mode", ExecutionMode.SEQUENTIAL)
 
-        logger.info(
+        # The user message is saved once; each agent's response refers to it
+        state["turn_id"] = await self.context_manager.begin_turn(
+            state["session_id"], state["user_id"], state["message"]
+        )
+
+        log.debug(
             "executing_agents",
-            session_id=state["session_id"],
             agents=state["selected_agents"],
             execution_mode=execution_mode,
             urgency=state["urgency"],
         )
 
+        state["aggregator"] = PartialAggregator(
+            chained=execution_mode != ExecutionMode.PARALLEL
+        )
+
         # Route to appropriate execution strategy
         if execution_mode == ExecutionMode.PARALLEL:
             responses = await self._execute_parallel(state)
@@ -771,84 +1297,19 @@ Now analyze the user's query."""),
 
         state["agent_responses"] = responses
 
-        logger.info(
+        log.info(
             "agents_executed",
-            session_id=state["session_id"],
             response_count=len(responses),
-            successful=sum(1 for r in responses if r.success),
-            failed=sum(1 for r in responses if not r.success),
+            successful=len(state["aggregator"].successful),
+            failed=len(responses) - len(state["aggregator"].successful),
         )
 
         return state
 
-    def _aggregate_sequential_responses(
-        self, responses: List[AgentResponse]
-    ) -> Dict[str, Any]:
-        """Aggregate responses from sequential execution."""
-        # In sequential mode, the last successful response is usually the most relevant
-        successful_responses = [r for r in responses if r.success]
-
-        if not successful_responses:
-            return {}
-
-        # Build a narrative from the agent chain
-        narrative_parts = []
-        aggregated_data = {}
-
-        for i, response in enumerate(successful_responses):
-            if response.message:
-                narrative_parts.append(f"{response.agent_name}: {response.message}")
-
-            if response.data:
-                aggregated_data[response.agent_name] = response.data
-
-        # The final message should synthesize the chain
-        if narrative_parts:
-            final_message = " → ".join(narrative_parts)
-        else:
-            final_message = successful_responses[-1].message or "Request processed successfully"
-
-        return {
-            "message": final_message,
-            "data": aggregated_data,
-            "execution_chain": [r.agent_name for r in successful_responses],
-        }
-
-    def _aggregate_parallel_responses(
-        self, responses: List[AgentResponse]
-    ) -> Dict[str, Any]:
-        """Aggregate responses from parallel execution."""
-        successful_responses = [r for r in responses if r.success]
-
-        if not successful_responses:
-            return {}
-
-        # Combine data from all agents
-        aggregated_data = {}
-        message_parts = []
-
-        for response in successful_responses:
-            if response.data:
-                aggregated_data[response.agent_name] = response.data
-
-            if response.message:
-                message_parts.append(f"• {response.agent_name}: {response.message}")
-
-        # Create a summary message
-        if message_parts:
-            final_message = "Combined results:\n" + "\n".join(message_parts)
-        else:
-            final_message = f"Data collected from {len(successful_responses)} agents"
-
-        return {
-            "message": final_message,
-            "data": aggregated_data,
-            "agents_contributed": [r.agent_name for r in successful_responses],
-        }
-
     async def _aggregate_responses(self, state: RouterState) -> RouterState:
         """Aggregate responses from multiple agents with intelligent combining."""
-        logger.info("aggregating_responses", session_id=state["session_id"])
+        log = state["log"]
+        log.debug("aggregating_responses")
 
         if not state["agent_responses"]:
             state["final_response"] = {
@@ -859,37 +1320,30 @@ Now analyze the user's query."""),
             }
             return state
 
-        # Combine successful responses
-        successful_responses = [
-            r for r in state["agent_responses"] if r.success
-        ]
+        # Responses were combined by the aggregator as each agent finished
+        aggregator = state["aggregator"]
+        successful_responses = aggregator.successful
 
         if not successful_responses:
             # All agents failed
-            errors = [r.error for r in state["agent_responses"] if r.error]
             state["final_response"] = {
                 "success": False,
                 "message": "All agents failed to process request",
-                "errors": errors,
+                "errors": aggregator.errors,
                 "agents_used": state["selected_agents"],
                 "execution_mode": state.get("execution_mode"),
             }
             return state
 
-        # Aggregate based on execution mode
         execution_mode = state.get("execution_mode", ExecutionMode.SEQUENTIAL)
-
-        if execution_mode == ExecutionMode.PARALLEL:
-            aggregation = self._aggregate_parallel_responses(successful_responses)
-        else:  # SEQUENTIAL or CONDITIONAL
-            aggregation = self._aggregate_sequential_responses(successful_responses)
+        aggregation = aggregator.result()
 
         # Build final response
         state["final_response"] = {
             "success": True,
             "message": aggregation.get("message", "Request processed successfully"),
             "data": aggregation.get("data", {}),
-            "agents_used": [r.agent_name for r in successful_responses],
+            "agents_used": aggregator.agent_names,
             "intent": state["intent"],
             "urgency": state["urgency"],
             "execution_mode": execution_mode,
@@ -904,9 +1358,8 @@ Now analyze the user's query."""),
         elif "agents_contributed" in aggregation:
             state["final_response"]["agents_contributed"] = aggregation["agents_contributed"]
 
-        logger.info(
+        log.info(
             "responses_aggregated",
-            session_id=state["session_id"],
             successful=len(successful_responses),
             failed=len(state["agent_responses"]) - len(successful_responses),
             execution_mode=execution_mode,
@@ -915,8 +1368,24 @@ Now analyze the user's query."""),
 
         return state
 
+    async def close(self):
+        """Finish recording cache hits and stop the background intent classification worker."""
+        if self._cached_turn_tasks:
+            await asyncio.gather(*self._cached_turn_tasks, return_exceptions=True)
+
+        if self._classify_worker_task is None:
+            return
+
+        self._classify_worker_task.cancel()
+        try:
+            await self._classify_worker_task
+        except asyncio.CancelledError:
+            pass
+        self._classify_worker_task = None
+
     def reset_circuit_breaker(self, agent_name: str):
         """Manually reset circuit breaker for an agent."""
+        self._open_breakers.discard(agent_name)
         if agent_name in self.agent_failure_counts:
             del self.agent_failure_counts[agent_name]
             logger.info("circuit_breaker_reset", agent=agent_name)
@@ -926,13 +1395,12 @@ Now analyze the user's query."""),
         return {
             "agent_failure_counts": self.agent_failure_counts.copy(),
             "agent_load_counter": self.agent_load_counter.copy(),
-            "circuit_breakers_open": [
-                agent for agent, count in self.agent_failure_counts.items()
-                if count >= self.circuit_breaker_threshold
-            ],
+            "circuit_breakers_open": list(self._open_breakers),
+            "fast_path_classifications": self.fast_path_classifications,
         }
 
     def reset_all_circuit_breakers(self):
         """Reset all circuit breakers (use with caution)."""
         self.agent_failure_counts.clear()
+        self._open_breakers.clear()
         logger.info("all_circuit_breakers_reset")
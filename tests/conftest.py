@@ -0,0 +1,45 @@
+"""Shared test configuration."""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from argon2 import PasswordHasher
+
+try:
+    import uvloop
+except ImportError:  # uvloop doesn't support Windows
+    uvloop = None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hasher():
+    """
+    Hash passwords with minimal argon2id cost during tests.
+
+    Hashes keep the production format, so verification is unchanged. Set
+    FAST_TEST_HASH=0 to test with the production cost.
+    """
+    if os.getenv("FAST_TEST_HASH", "1") != "1":
+        yield
+        return
+
+    hasher = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+    with patch("src.auth.jwt_handler.get_password_hasher", return_value=hasher):
+        yield
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a uvloop event loop, the loop uvicorn serves with, if installed."""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+@pytest.fixture
+def event_loop():
+    """Run each async test on a fresh event loop from new_event_loop."""
+    loop = new_event_loop()
+    yield loop
+    loop.close()
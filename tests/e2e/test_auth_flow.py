@@ -1,5 +1,7 @@
 """End-to-end tests for authentication flow."""
 
+import asyncio
+
 import pytest
 from tests.e2e.conftest import assert_valid_jwt_response
 
@@ -8,17 +10,9 @@ class TestAuthenticationFlow:
     """Test user authentication flows."""
 
     @pytest.mark.asyncio
-    async def test_user_registration(self, http_client):
+    async def test_user_registration(self, seeded_users):
         """Test user registration flow."""
-        # Register new user
-        response = await http_client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "newuser123",
-                "email": "newuser@example.com",
-                "password": "SecurePass123!",
-            },
-        )
+        _, response = seeded_users["newuser123"]
 
         assert response.status_code == 201
         data = response.json()
@@ -26,15 +20,11 @@ class TestAuthenticationFlow:
         assert data["username"] == "newuser123"
 
     @pytest.mark.asyncio
-    async def test_duplicate_registration(self, http_client, test_user_credentials):
+    async def test_duplicate_registration(
+        self, http_client, test_user_credentials, authenticated_user
+    ):
         """Test that duplicate registration fails."""
-        # First registration
-        await http_client.post(
-            "/api/v1/auth/register",
-            json=test_user_credentials,
-        )
-
-        # Attempt duplicate registration
+        # The session's test user is already registered
         response = await http_client.post(
             "/api/v1/auth/register",
             json=test_user_credentials,
@@ -45,14 +35,8 @@ class TestAuthenticationFlow:
         assert "already registered" in data["detail"].lower()
 
     @pytest.mark.asyncio
-    async def test_user_login(self, http_client, test_user_credentials):
+    async def test_user_login(self, http_client, test_user_credentials, authenticated_user):
         """Test user login flow."""
-        # Register user first
-        await http_client.post(
-            "/api/v1/auth/register",
-            json=test_user_credentials,
-        )
-
         # Login
         response = await http_client.post(
             "/api/v1/auth/login",
@@ -81,10 +65,11 @@ class TestAuthenticationFlow:
         data = response.json()
         assert "incorrect" in data["detail"].lower()
 
+    @pytest.mark.contract
     @pytest.mark.asyncio
-    async def test_protected_endpoint_without_auth(self, http_client):
+    async def test_protected_endpoint_without_auth(self, contract_client):
         """Test that protected endpoints require authentication."""
-        response = await http_client.get("/api/v1/agents")
+        response = await contract_client.get("/api/v1/agents")
 
         assert response.status_code == 403
 
@@ -120,17 +105,11 @@ class TestAuthenticationSecurity:
     """Test authentication security features."""
 
     @pytest.mark.asyncio
-    async def test_password_hashing(self, http_client, test_user_credentials, db_session):
+    async def test_password_hashing(self, test_user_credentials, authenticated_user, db_session):
         """Test that passwords are hashed in database."""
         from src.database.models import User
         from sqlalchemy import select
 
-        # Register user
-        await http_client.post(
-            "/api/v1/auth/register",
-            json=test_user_credentials,
-        )
-
         # Check database
         result = await db_session.execute(
             select(User).where(User.username == test_user_credentials["username"])
@@ -143,6 +122,7 @@ class TestAuthenticationSecurity:
         # Hashed password should be longer
         assert len(user.hashed_password) > len(test_user_credentials["password"])
 
+    @pytest.mark.skip(reason="no password policy implemented")
     @pytest.mark.asyncio
     async def test_weak_password_rejected(self, http_client):
         """Test that weak passwords are rejected (if validation exists)."""
@@ -156,9 +136,7 @@ class TestAuthenticationSecurity:
             },
         )
 
-        # Should either reject or accept based on implementation
-        # Adjust assertion based on your password policy
-        assert response.status_code in [201, 400, 422]
+        assert response.status_code in [400, 422]
 
 
 class TestAuthenticationWorkflow:
@@ -166,18 +144,11 @@ class TestAuthenticationWorkflow:
 
     @pytest.mark.asyncio
     async def test_complete_registration_to_api_call_flow(
-        self, http_client, sample_baggage_query
+        self, http_client, seeded_users, sample_baggage_query
     ):
         """Test complete flow from registration to making API call."""
         # Step 1: Register
-        register_response = await http_client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "flowtest123",
-                "email": "flowtest@example.com",
-                "password": "FlowTest123!",
-            },
-        )
+        _, register_response = seeded_users["flowtest123"]
 
         assert register_response.status_code == 201
         auth_data = register_response.json()
@@ -200,19 +171,9 @@ class TestAuthenticationWorkflow:
         assert chat_response.status_code == 200
 
     @pytest.mark.asyncio
-    async def test_login_after_registration_flow(self, http_client):
+    async def test_login_after_registration_flow(self, http_client, seeded_users):
         """Test login immediately after registration."""
-        credentials = {
-            "username": "logintest",
-            "email": "logintest@example.com",
-            "password": "LoginTest123!",
-        }
-
-        # Register
-        register_response = await http_client.post(
-            "/api/v1/auth/register",
-            json=credentials,
-        )
+        credentials, register_response = seeded_users["logintest"]
         assert register_response.status_code == 201
 
         # Login with same credentials
@@ -229,31 +190,26 @@ class TestAuthenticationWorkflow:
         assert_valid_jwt_response(login_data)
 
     @pytest.mark.asyncio
-    async def test_multiple_logins_generate_valid_tokens(self, http_client, test_user_credentials):
+    async def test_multiple_logins_generate_valid_tokens(
+        self, http_client, test_user_credentials, authenticated_user
+    ):
         """Test that multiple logins generate different valid tokens."""
-        # Register once
-        await http_client.post(
-            "/api/v1/auth/register",
-            json=test_user_credentials,
-        )
-
-        # Login multiple times
-        tokens = []
-        for _ in range(3):
-            response = await http_client.post(
-                "/api/v1/auth/login",
-                json={
-                    "username": test_user_credentials["username"],
-                    "password": test_user_credentials["password"],
-                },
-            )
-            data = response.json()
-            tokens.append(data["access_token"])
+        # Login multiple times concurrently
+        login = {
+            "username": test_user_credentials["username"],
+            "password": test_user_credentials["password"],
+        }
+        login_responses = await asyncio.gather(*[
+            http_client.post("/api/v1/auth/login", json=login) for _ in range(3)
+        ])
+        tokens = [response.json()["access_token"] for response in login_responses]
 
         # All tokens should be valid but may be different
-        for token in tokens:
-            headers = {"Authorization": f"Bearer {token}"}
-            response = await http_client.get("/api/v1/agents", headers=headers)
+        responses = await asyncio.gather(*[
+            http_client.get("/api/v1/agents", headers={"Authorization": f"Bearer {token}"})
+            for token in tokens
+        ])
+        for response in responses:
             assert response.status_code == 200
 
 
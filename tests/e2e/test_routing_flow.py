@@ -3,30 +3,18 @@
 import pytest
 from tests.e2e.conftest import assert_successful_response, assert_failed_response
 
+# Payloads shared by several tests; extend with "|" rather than mutating
+TRACK_BAG_QUERY = {"message": "Track bag NH459"}
+RISK_FOLLOW_UP_QUERY = {"message": "What's the risk for this bag?"}
+LONG_MESSAGE_QUERY = {"message": "Track bag " + "A" * 10_000}
 
-class TestBasicRouting:
-    """Test basic request routing functionality."""
-
-    @pytest.mark.asyncio
-    async def test_chat_endpoint_basic(
-        self, http_client, auth_headers, sample_baggage_query
-    ):
-        """Test basic chat endpoint."""
-        response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json=sample_baggage_query,
-        )
+# Statuses for input the API may either accept or reject
+ACCEPTED_OR_INVALID = frozenset({200, 400, 422})
+ACCEPTED_OR_TOO_LARGE = ACCEPTED_OR_INVALID | {413}
 
-        assert response.status_code == 200
-        data = response.json()
 
-        # Verify response structure
-        assert "session_id" in data
-        assert "success" in data
-        assert "message" in data
-        assert "agents_used" in data
-        assert "intent" in data
+class TestBasicRouting:
+    """Test basic request routing functionality."""
 
     @pytest.mark.asyncio
     async def test_chat_with_session_id(
@@ -38,10 +26,7 @@ class TestBasicRouting:
         response = await http_client.post(
             "/api/v1/chat",
             headers=auth_headers,
-            json={
-                **sample_baggage_query,
-                "session_id": session_id,
-            },
+            json=sample_baggage_query | {"session_id": session_id},
         )
 
         assert response.status_code == 200
@@ -61,6 +46,7 @@ class TestBasicRouting:
         assert response.status_code == 403
 
 
+@pytest.mark.usefixtures("mock_llm_classifier")
 class TestIntentClassification:
     """Test intent classification for different query types."""
 
@@ -120,6 +106,7 @@ class TestIntentClassification:
                "causing" in data.get("intent", "").lower()
 
 
+@pytest.mark.usefixtures("mock_llm_classifier")
 class TestExecutionModes:
     """Test different execution modes (sequential, parallel, conditional)."""
 
@@ -180,6 +167,7 @@ class TestExecutionModes:
         assert data["success"] is not None
 
 
+@pytest.mark.usefixtures("mock_llm_classifier")
 class TestUrgencyDetection:
     """Test urgency level detection."""
 
@@ -224,6 +212,7 @@ class TestUrgencyDetection:
             assert data["urgency"] in ["high", "medium", "low"]
 
 
+@pytest.mark.live_llm
 class TestMultiAgentOrchestration:
     """Test multi-agent orchestration scenarios."""
 
@@ -258,10 +247,7 @@ class TestMultiAgentOrchestration:
         response1 = await http_client.post(
             "/api/v1/chat",
             headers=auth_headers,
-            json={
-                "message": "Track bag NH459",
-                "session_id": session_id,
-            },
+            json=TRACK_BAG_QUERY | {"session_id": session_id},
         )
 
         assert response1.status_code == 200
@@ -270,10 +256,7 @@ class TestMultiAgentOrchestration:
         response2 = await http_client.post(
             "/api/v1/chat",
             headers=auth_headers,
-            json={
-                "message": "What's the risk for this bag?",
-                "session_id": session_id,
-            },
+            json=RISK_FOLLOW_UP_QUERY | {"session_id": session_id},
         )
 
         assert response2.status_code == 200
@@ -296,36 +279,21 @@ class TestErrorHandling:
         )
 
         # Should handle gracefully
-        assert response.status_code in [200, 400, 422]
+        assert response.status_code in ACCEPTED_OR_INVALID
 
     @pytest.mark.asyncio
     async def test_very_long_message(
         self, http_client, auth_headers
     ):
         """Test handling of very long message."""
-        long_message = "Track bag " + "A" * 10000
-
         response = await http_client.post(
             "/api/v1/chat",
             headers=auth_headers,
-            json={"message": long_message},
+            json=LONG_MESSAGE_QUERY,
         )
 
         # Should handle gracefully (truncate or reject)
-        assert response.status_code in [200, 400, 413, 422]
-
-    @pytest.mark.asyncio
-    async def test_malformed_request(
-        self, http_client, auth_headers
-    ):
-        """Test handling of malformed request."""
-        response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json={"wrong_field": "value"},
-        )
-
-        assert response.status_code == 422  # Validation error
+        assert response.status_code in ACCEPTED_OR_TOO_LARGE
 
     @pytest.mark.asyncio
     async def test_invalid_session_id(
@@ -335,29 +303,20 @@ class TestErrorHandling:
         response = await http_client.post(
             "/api/v1/chat",
             headers=auth_headers,
-            json={
-                "message": "Track bag NH459",
-                "session_id": "invalid!@#$%^&*()",
-            },
+            json=TRACK_BAG_QUERY | {"session_id": "invalid!@#$%^&*()"},
         )
 
         # Should either accept or reject based on validation
-        assert response.status_code in [200, 400, 422]
+        assert response.status_code in ACCEPTED_OR_INVALID
 
 
 class TestResponseStructure:
     """Test response structure and data."""
 
     @pytest.mark.asyncio
-    async def test_response_contains_required_fields(
-        self, http_client, auth_headers, sample_baggage_query
-    ):
-        """Test that response contains all required fields."""
-        response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json=sample_baggage_query,
-        )
+    async def test_response_shape(self, baggage_chat_response):
+        """Test that one response has all fields with the expected types."""
+        response = baggage_chat_response
 
         assert response.status_code == 200
         data = response.json()
@@ -367,38 +326,7 @@ class TestResponseStructure:
         assert "success" in data
         assert "message" in data
         assert "agents_used" in data
-
-    @pytest.mark.asyncio
-    async def test_response_metadata(
-        self, http_client, auth_headers, sample_baggage_query
-    ):
-        """Test that response contains metadata."""
-        response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json=sample_baggage_query,
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # Optional but expected metadata
-        if data.get("success"):
-            assert "intent" in data or "message" in data
-
-    @pytest.mark.asyncio
-    async def test_agents_used_is_list(
-        self, http_client, auth_headers, sample_baggage_query
-    ):
-        """Test that agents_used is always a list."""
-        response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json=sample_baggage_query,
-        )
-
-        assert response.status_code == 200
-        data = response.json()
+        assert "intent" in data
 
         assert isinstance(data["agents_used"], list)
 
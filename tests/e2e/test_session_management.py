@@ -61,17 +61,11 @@ class TestSessionCreation:
 
     @pytest.mark.asyncio
     async def test_get_session_endpoint(
-        self, http_client, auth_headers, sample_baggage_query
+        self, http_client, auth_headers, baggage_chat_response
     ):
         """Test getting session information."""
-        # Create session via chat
-        chat_response = await http_client.post(
-            "/api/v1/chat",
-            headers=auth_headers,
-            json=sample_baggage_query,
-        )
-
-        session_id = chat_response.json()["session_id"]
+        # Session created by the module's baggage chat
+        session_id = baggage_chat_response.json()["session_id"]
 
         # Get session info
         session_response = await http_client.get(
@@ -91,27 +85,10 @@ class TestSessionHistory:
 
     @pytest.mark.asyncio
     async def test_get_session_history(
-        self, http_client, auth_headers
+        self, http_client, auth_headers, seed_history
     ):
         """Test retrieving session history."""
-        session_id = "history-test-123"
-
-        # Make several requests
-        messages = [
-            "Track bag NH459",
-            "What's the risk?",
-            "Create recovery plan",
-        ]
-
-        for msg in messages:
-            await http_client.post(
-                "/api/v1/chat",
-                headers=auth_headers,
-                json={
-                    "message": msg,
-                    "session_id": session_id,
-                },
-            )
+        session_id = await seed_history(3)
 
         # Get history
         history_response = await http_client.get(
@@ -119,30 +96,18 @@ class TestSessionHistory:
             headers=auth_headers,
         )
 
-        if history_response.status_code == 200:
-            history_data = history_response.json()
-            assert "history" in history_data
-            assert isinstance(history_data["history"], list)
-            # Should have at least some history
-            assert len(history_data["history"]) > 0
+        assert history_response.status_code == 200
+        history_data = history_response.json()
+        assert "history" in history_data
+        assert isinstance(history_data["history"], list)
+        assert len(history_data["history"]) == 3
 
     @pytest.mark.asyncio
     async def test_history_limit(
-        self, http_client, auth_headers
+        self, http_client, auth_headers, seed_history
     ):
         """Test history limit parameter."""
-        session_id = "limit-test-123"
-
-        # Make multiple requests
-        for i in range(10):
-            await http_client.post(
-                "/api/v1/chat",
-                headers=auth_headers,
-                json={
-                    "message": f"Message {i}",
-                    "session_id": session_id,
-                },
-            )
+        session_id = await seed_history(10)
 
         # Get limited history
         history_response = await http_client.get(
@@ -150,10 +115,12 @@ class TestSessionHistory:
             headers=auth_headers,
         )
 
-        if history_response.status_code == 200:
-            history_data = history_response.json()
-            # Should respect limit
-            assert len(history_data["history"]) <= 5
+        assert history_response.status_code == 200
+        history = history_response.json()["history"]
+        # Newest five turns, oldest first
+        assert [turn["user_message"] for turn in history] == [
+            f"Message {i}" for i in range(5, 10)
+        ]
 
 
 class TestSessionDeletion:
@@ -208,48 +175,22 @@ class TestSessionSecurity:
 
     @pytest.mark.asyncio
     async def test_cannot_access_other_user_session(
-        self, http_client
+        self, http_client, user_pool
     ):
         """Test that users cannot access other users' sessions."""
-        # Create first user and session
-        user1_response = await http_client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "user1",
-                "email": "user1@example.com",
-                "password": "Password123!",
-            },
-        )
-
-        user1_token = user1_response.json()["access_token"]
-        user1_headers = {"Authorization": f"Bearer {user1_token}"}
-
         # Create session for user1
         chat_response = await http_client.post(
             "/api/v1/chat",
-            headers=user1_headers,
+            headers=user_pool["user1"],
             json={"message": "Test message"},
         )
 
         session_id = chat_response.json()["session_id"]
 
-        # Create second user
-        user2_response = await http_client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "user2",
-                "email": "user2@example.com",
-                "password": "Password123!",
-            },
-        )
-
-        user2_token = user2_response.json()["access_token"]
-        user2_headers = {"Authorization": f"Bearer {user2_token}"}
-
         # Try to access user1's session as user2
         get_response = await http_client.get(
             f"/api/v1/sessions/{session_id}",
-            headers=user2_headers,
+            headers=user_pool["user2"],
         )
 
         # Should be forbidden
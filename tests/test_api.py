@@ -1,22 +1,36 @@
 """Tests for API endpoints."""
 
+import asyncio
 import pytest
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from unittest.mock import Mock, patch, AsyncMock
+import time
 import uuid
 
+import jwt
+
 from src.api.main import app
+from src.api.state import get_app_state
+from src.auth.dependencies import get_current_active_user
 from src.database.models import User
 from src.auth.jwt_handler import JWTHandler
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create test client."""
-    return TestClient(app)
+    """
+    Create test client.
 
+    The ASGI transport calls the app directly in the test's event loop and
+    holds no connections, so one client serves the whole module. It is
+    closed on a loop of its own, since the test loops are gone by teardown.
+    """
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    yield client
+    asyncio.run(client.aclose())
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def test_user():
     """Create test user."""
     return User(
@@ -44,9 +58,10 @@ def auth_token():
 class TestHealthEndpoints:
     """Test health check endpoints."""
 
-    def test_root_endpoint(self, client):
+    @pytest.mark.asyncio
+    async def test_root_endpoint(self, client):
         """Test root endpoint."""
-        response = client.get("/")
+        response = await client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert data["service"] == "Airline Meta Agent Orchestrator"
@@ -56,8 +71,9 @@ class TestHealthEndpoints:
 class TestAuthenticationEndpoints:
     """Test authentication endpoints."""
 
+    @pytest.mark.asyncio
     @patch('src.api.routes.get_app_state')
-    def test_register_endpoint(self, mock_get_app_state, client):
+    async def test_register_endpoint(self, mock_get_app_state, client):
         """Test user registration endpoint."""
         # Mock app state and database
         mock_app_state = Mock()
@@ -73,8 +89,9 @@ class TestAuthenticationEndpoints:
         # Note: This is a basic test structure. Full implementation would require
         # more complex mocking of database operations
 
+    @pytest.mark.asyncio
     @patch('src.api.routes.get_app_state')
-    def test_login_endpoint(self, mock_get_app_state, client):
+    async def test_login_endpoint(self, mock_get_app_state, client):
         """Test login endpoint."""
         # Similar structure to registration test
         # Would require mocking database and JWT operations
@@ -84,23 +101,93 @@ class TestAuthenticationEndpoints:
 class TestChatEndpoints:
     """Test chat endpoints."""
 
-    def test_chat_requires_authentication(self, client):
+    @pytest.mark.asyncio
+    async def test_chat_requires_authentication(self, client):
         """Test that chat endpoint requires authentication."""
-        response = client.post(
+        response = await client.post(
             "/api/v1/chat",
             json={"message": "Hello"},
         )
         assert response.status_code == 403  # Forbidden without auth
 
+    @pytest.mark.asyncio
+    async def test_chat_rejects_malformed_request(self, client, test_user):
+        """Test that a request without a message fails validation."""
+        app.dependency_overrides[get_current_active_user] = lambda: test_user
+        try:
+            response = await client.post(
+                "/api/v1/chat",
+                json={"wrong_field": "value"},
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_chat_returns_routed_response(self, client, test_user):
+        """Test that the routed result is returned as a ChatResponse."""
+        app_state = Mock()
+        app_state.context_manager.get_or_create_session = AsyncMock()
+        app_state.router.route_request = AsyncMock(return_value={
+            "success": True,
+            "message": "Bag located",
+            "data": {"tracker": {"location": "Gate 14", "eta": None}},
+            "agents_used": ["tracker"],
+            "intent": "locate baggage",
+            "execution_mode": "sequential",
+        })
+        app.dependency_overrides[get_current_active_user] = lambda: test_user
+        app.dependency_overrides[get_app_state] = lambda: app_state
+        try:
+            response = await client.post(
+                "/api/v1/chat",
+                json={"message": "Where is my bag?", "session_id": "session-1"},
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "session_id": "session-1",
+            "success": True,
+            "message": "Bag located",
+            "data": {"tracker": {"location": "Gate 14", "eta": None}},
+            "agents_used": ["tracker"],
+            "intent": "locate baggage",
+        }
+
 
 class TestAgentEndpoints:
     """Test agent management endpoints."""
 
-    def test_list_agents_requires_authentication(self, client):
+    @pytest.mark.asyncio
+    async def test_list_agents_requires_authentication(self, client):
         """Test that listing agents requires authentication."""
-        response = client.get("/api/v1/agents")
+        response = await client.get("/api/v1/agents")
         assert response.status_code == 403
 
 
+class TestJWTHandler:
+    """Test JWT token verification."""
+
+    def test_verified_token_is_cached_until_expiry(self):
+        """Test that a repeated token skips decoding until it expires."""
+        jwt_handler = JWTHandler(secret_key="test_secret", expiration_minutes=1)
+        token = jwt_handler.create_access_token(data={"sub": "testuser", "user_id": "1"})
+
+        with patch("src.auth.jwt_handler.jwt.decode", wraps=jwt.decode) as decode:
+            first = jwt_handler.verify_token(token)
+            second = jwt_handler.verify_token(token)
+            assert decode.call_count == 1
+
+            # Past the cached expiry the token is fully verified again
+            with patch("src.auth.jwt_handler.time.time", return_value=time.time() + 120):
+                jwt_handler.verify_token(token)
+            assert decode.call_count == 2
+
+        assert first.username == second.username == "testuser"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,13 +1,41 @@
 """Tests for orchestrator components."""
 
+import asyncio
+import httpx
+import orjson
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-import uuid
 
 from src.agents.base_agent import AgentMetadata, AgentRequest, AgentResponse, AgentStatus
 from src.agents.agent_client import AgentClient
+from src.agents.circuit import AsyncCircuitBreaker, CircuitOpenError
 from src.orchestrator.registry import AgentRegistry
-from src.orchestrator.context_manager import SessionContext
+from src.orchestrator.router import URGENCY_BUDGET, PartialAggregator, RequestRouter
+from src.orchestrator.intent_cache import IntentCache
+from src.orchestrator.intent_classifier import IntentClassifier
+from src.orchestrator.response_cache import ResponseCache
+from src.database.models import ConversationHistory, ConversationTurn
+from src.orchestrator.context_manager import (
+    COMPRESSED_PREFIX,
+    ContextManager,
+    SessionContext,
+    _decode_value,
+    _encode_value,
+)
+
+# Validated once; fixtures hand out copies since health checks set status
+TEST_AGENT_METADATA = AgentMetadata(
+    name="test_agent",
+    domain="test_domain",
+    url="http://localhost:8001",
+    capabilities=["test"],
+    description="Test agent",
+)
+
+
+# Fixed IDs; the session context tests only check round trips
+TEST_SESSION_ID = "11111111-1111-4111-8111-111111111111"
+TEST_USER_ID = "22222222-2222-4222-8222-222222222222"
 
 
 class TestAgentClient:
@@ -16,18 +44,13 @@ class TestAgentClient:
     @pytest.fixture
     def agent_metadata(self):
         """Create test agent metadata."""
-        return AgentMetadata(
-            name="test_agent",
-            domain="test_domain",
-            url="http://localhost:8001",
-            capabilities=["test"],
-            description="Test agent",
-        )
+        return TEST_AGENT_METADATA.model_copy()
 
     @pytest.fixture
     def agent_client(self, agent_metadata):
-        """Create test agent client."""
-        return AgentClient(agent_metadata)
+        """Create test agent client whose own HTTP client answers every request with 200."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        return AgentClient(agent_metadata, client=httpx.AsyncClient(transport=transport))
 
     def test_agent_initialization(self, agent_client, agent_metadata):
         """Test agent client initialization."""
@@ -38,24 +61,51 @@ class TestAgentClient:
     @pytest.mark.asyncio
     async def test_health_check_success(self, agent_client):
         """Test successful health check."""
-        with patch.object(agent_client.client, 'get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_get.return_value = mock_response
-
-            result = await agent_client.health_check()
-            assert result is True
-            assert agent_client.metadata.status == AgentStatus.HEALTHY
+        result = await agent_client.health_check()
+        assert result is True
+        assert agent_client.metadata.status == AgentStatus.HEALTHY
 
     @pytest.mark.asyncio
     async def test_health_check_failure(self, agent_client):
         """Test failed health check."""
-        with patch.object(agent_client.client, 'get') as mock_get:
-            mock_get.side_effect = Exception("Connection failed")
+        # The HTTP client is built per test, so its method can be replaced outright
+        agent_client.client.get = AsyncMock(side_effect=Exception("Connection failed"))
+
+        result = await agent_client.health_check()
+        assert result is False
+        assert agent_client.metadata.status == AgentStatus.UNAVAILABLE
+
 
-            result = await agent_client.health_check()
-            assert result is False
-            assert agent_client.metadata.status == AgentStatus.UNAVAILABLE
+class TestAsyncCircuitBreaker:
+    """Test AsyncCircuitBreaker class."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_fail_max(self):
+        """Test breaker opens after consecutive failures."""
+        breaker = AsyncCircuitBreaker(fail_max=2, timeout_duration=60)
+        failing = AsyncMock(side_effect=Exception("boom"))
+
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await breaker.call(failing)
+
+        assert breaker.state == AsyncCircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(failing)
+        assert failing.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_trial_closes_breaker(self):
+        """Test a successful trial call closes an expired open breaker."""
+        breaker = AsyncCircuitBreaker(fail_max=1, timeout_duration=0)
+        with pytest.raises(Exception):
+            await breaker.call(AsyncMock(side_effect=Exception("boom")))
+
+        result = await breaker.call(AsyncMock(return_value="ok"))
+
+        assert result == "ok"
+        assert breaker.state == AsyncCircuitBreaker.CLOSED
+        assert breaker.failure_count == 0
 
 
 class TestSessionContext:
@@ -63,8 +113,8 @@ class TestSessionContext:
 
     def test_session_context_creation(self):
         """Test session context creation."""
-        session_id = str(uuid.uuid4())
-        user_id = str(uuid.uuid4())
+        session_id = TEST_SESSION_ID
+        user_id = TEST_USER_ID
 
         context = SessionContext(
             session_id=session_id,
@@ -76,52 +126,150 @@ class TestSessionContext:
         assert context.agent_chain == []
         assert context.context_variables == {}
 
-    def test_session_context_to_dict(self):
-        """Test session context serialization."""
-        session_id = str(uuid.uuid4())
-        user_id = str(uuid.uuid4())
-
+    def test_session_context_json_round_trip(self):
+        """Test session context serialization through JSON and back."""
         context = SessionContext(
-            session_id=session_id,
-            user_id=user_id,
+            session_id=TEST_SESSION_ID,
+            user_id=TEST_USER_ID,
             agent_chain=["agent1", "agent2"],
             context_variables={"key": "value"},
         )
 
-        data = context.to_dict()
+        data = orjson.loads(orjson.dumps(context.to_dict()))
 
-        assert data["session_id"] == session_id
-        assert data["user_id"] == user_id
+        assert data["session_id"] == TEST_SESSION_ID
+        assert data["user_id"] == TEST_USER_ID
         assert data["agent_chain"] == ["agent1", "agent2"]
         assert data["context_variables"]["key"] == "value"
 
-    def test_session_context_from_dict(self):
-        """Test session context deserialization."""
-        session_id = str(uuid.uuid4())
-        user_id = str(uuid.uuid4())
+        restored = SessionContext.from_dict(data)
 
-        data = {
-            "session_id": session_id,
-            "user_id": user_id,
-            "agent_chain": ["agent1"],
-            "context_variables": {"test": "value"},
-        }
+        assert restored.to_dict() == context.to_dict()
 
-        context = SessionContext.from_dict(data)
+    def test_session_context_timestamps_round_trip(self):
+        """Test that epoch timestamps survive serialization."""
+        context = SessionContext(session_id="s", user_id="u")
 
-        assert context.session_id == session_id
-        assert context.user_id == user_id
-        assert context.agent_chain == ["agent1"]
-        assert context.context_variables["test"] == "value"
+        data = context.to_dict()
+        restored = SessionContext.from_dict({
+            **data,
+            "created_at": str(data["created_at"]),
+        })
 
+        assert restored.created_at == context.created_at
+        assert restored.updated_at == context.updated_at
 
-class TestAgentRegistry:
-    """Test AgentRegistry class."""
+    def test_context_variable_compression_round_trip(self):
+        """Test that large context variables are compressed and decoded."""
+        small = {"key": "value"}
+        large = {"itinerary": ["LAX-JFK"] * 500}
 
-    @pytest.fixture
-    def config_file(self, tmp_path):
-        """Create temporary config file."""
-        config_content = """
+        encoded_small = _encode_value(small).decode()
+        encoded_large = _encode_value(large).decode()
+
+        assert not encoded_small.startswith(COMPRESSED_PREFIX)
+        assert encoded_large.startswith(COMPRESSED_PREFIX)
+        assert _decode_value(encoded_small) == small
+        assert _decode_value(encoded_large) == large
+
+
+class TestContextManager:
+    """Test ContextManager class."""
+
+    @pytest.mark.asyncio
+    async def test_turn_saves_user_message_once(self):
+        """Test that agent responses reference their turn instead of the message."""
+        db_session = AsyncMock()
+        session_factory = Mock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=db_session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = ContextManager(redis_client=Mock(), session_factory=session_factory)
+
+        turn_id = await manager.begin_turn("s", "u", "Where is bag 0012345678?")
+        await manager.save_agent_responses(turn_id, "s", "u", [
+            AgentResponse(success=True, agent_name=agent_name, message="ok")
+            for agent_name in ["tracker", "risk"]
+        ])
+
+        inserts = [call.args for call in db_session.execute.await_args_list]
+        assert len(inserts) == 2
+        assert inserts[0][0].table.name == ConversationTurn.__tablename__
+        assert inserts[0][1][0]["user_message"] == "Where is bag 0012345678?"
+        statement, rows = inserts[1]
+        assert statement.table.name == ConversationHistory.__tablename__
+        assert [row["agent_name"] for row in rows] == ["tracker", "risk"]
+        assert all(row["turn_id"] == turn_id and row["user_message"] is None for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_get_sessions_keys_contexts_by_id(self):
+        """Test that batched session reads map results to IDs and skip missing sessions."""
+        hashes, lists = {}, {}
+        for session_id, user_id, chain, variables in [
+            ("s1", "u1", ["tracker"], {"bag": "0012345678"}),
+            ("s3", "u3", [], {}),
+        ]:
+            context = SessionContext(session_id=session_id, user_id=user_id)
+            hashes[f"session:{session_id}"] = {
+                name: str(value) for name, value in ContextManager._session_fields(context).items()
+            }
+            lists[f"session:{session_id}:chain"] = chain
+            hashes[f"session:{session_id}:vars"] = {
+                name: value.decode()
+                for name, value in ContextManager._encode_variables(variables).items()
+            }
+
+        commands = []
+        pipe = Mock()
+        pipe.hgetall = lambda key: commands.append(hashes.get(key, {}))
+        pipe.lrange = lambda key, start, end: commands.append(lists.get(key, []))
+        pipe.execute = AsyncMock(side_effect=lambda: commands)
+        redis_client = Mock()
+        redis_client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+        redis_client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = ContextManager(redis_client=redis_client, session_factory=Mock())
+
+        sessions = await manager.get_sessions(["s1", "s2", "s3"])
+
+        assert sessions.keys() == {"s1", "s3"}
+        assert [(s.session_id, s.user_id) for s in sessions.values()] == [
+            ("s1", "u1"), ("s3", "u3")
+        ]
+        assert sessions["s1"].agent_chain == ["tracker"]
+        assert sessions["s1"].context_variables == {"bag": "0012345678"}
+        assert sessions["s3"].agent_chain == []
+        assert sessions["s3"].context_variables == {}
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_ignores_rows_queued_later(self):
+        """Test that a history read waits for earlier rows, not steady later traffic."""
+        written = []
+
+        async def write(rows):
+            await asyncio.sleep(0.01)
+            written.extend(row["user_message"] for _, row in rows)
+
+        manager = ContextManager(redis_client=Mock(), session_factory=Mock())
+        manager._write_conversations = write
+        manager.start()
+
+        async def traffic():
+            while True:
+                await manager.save_conversation("other", "u", "agent", "later", "ok")
+                await asyncio.sleep(0)
+
+        await manager.save_conversation("s", "u", "agent", "earlier", "ok")
+        producer = asyncio.create_task(traffic())
+        try:
+            await asyncio.wait_for(manager._flush_queued(), timeout=1)
+        finally:
+            producer.cancel()
+
+        assert written[0] == "earlier"
+        await manager.close()
+
+
+TEST_AGENTS_CONFIG_YAML = b"""
 agents:
   test_domain:
     test_agent:
@@ -133,9 +281,41 @@ agents:
       timeout: 30
       retry_count: 3
 """
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(config_content)
-        return str(config_file)
+
+
+@pytest.fixture(scope="session")
+def config_file(tmp_path_factory):
+    """Create temporary config file, written once per session."""
+    config_file = tmp_path_factory.mktemp("config") / "test_config.yaml"
+    config_file.write_bytes(TEST_AGENTS_CONFIG_YAML)
+    return str(config_file)
+
+
+# Parsed equivalent of config_file, for registries that don't test file loading
+TEST_AGENTS_CONFIG = {
+    "agents": {
+        "test_domain": {
+            "test_agent": {
+                "url": "http://localhost:8001",
+                "capabilities": ["test"],
+                "description": "Test agent",
+                "health_check_endpoint": "/health",
+                "timeout": 30,
+                "retry_count": 3,
+            },
+        },
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def loaded_registry():
+    """Registry built once per module; read-only in tests."""
+    return AgentRegistry.from_dict(TEST_AGENTS_CONFIG)
+
+
+class TestAgentRegistry:
+    """Test AgentRegistry class."""
 
     @pytest.mark.asyncio
     async def test_load_agents(self, config_file):
@@ -143,39 +323,450 @@ agents:
         registry = AgentRegistry(config_file)
         await registry.load_agents()
 
-        assert len(registry.agents) == 1
-        assert "test_agent" in registry.agents
-        assert "test_domain" in registry.agents_by_domain
+        assert registry.agents.keys() == {"test_agent"}
+        assert registry.agents_by_domain == {"test_domain": ["test_agent"]}
+        assert registry.agents["test_agent"].metadata == AgentRegistry.from_dict(
+            TEST_AGENTS_CONFIG
+        ).agents["test_agent"].metadata
+
+    @pytest.mark.parametrize("method, key", [
+        ("get_agent", "test_agent"),
+        ("get_agents_by_domain", "test_domain"),
+        ("get_agents_by_capability", "test"),
+    ])
+    def test_lookup(self, loaded_registry, method, key):
+        """Test getting agents by name, domain and capability."""
+        result = getattr(loaded_registry, method)(key)
+        agents = result if isinstance(result, list) else [result]
+        assert [agent.metadata.name for agent in agents] == ["test_agent"]
+
+    def test_reload_rebuilds_indexes(self):
+        """Test that registering the configuration again leaves no duplicates."""
+        registry = AgentRegistry.from_dict(TEST_AGENTS_CONFIG)
+        registry._register_agents(TEST_AGENTS_CONFIG)
+
+        assert registry.agents_by_capability == {"test": ["test_agent"]}
+        assert registry.get_registry_stats()["status_breakdown"] == {AgentStatus.UNAVAILABLE: 1}
+
+    def test_healthy_agents_keep_registration_order(self):
+        """Test that healthy agents are listed in registration order."""
+        registry = AgentRegistry.from_dict({"agents": {"test_domain": {
+            name: {"url": "http://localhost", "capabilities": ["test"], "description": name}
+            for name in ["first", "second", "third"]
+        }}})
+
+        for name in ["third", "first", "second"]:
+            registry._set_status(name, AgentStatus.HEALTHY)
+
+        assert [agent.metadata.name for agent in registry.get_healthy_agents()] == [
+            "first", "second", "third"
+        ]
 
     @pytest.mark.asyncio
-    async def test_get_agent(self, config_file):
-        """Test getting agent by name."""
-        registry = AgentRegistry(config_file)
-        await registry.load_agents()
+    async def test_healthy_agents_follow_health_checks(self):
+        """Test that the status index tracks health check results."""
+        registry = AgentRegistry.from_dict(TEST_AGENTS_CONFIG)
+        assert registry.get_healthy_agents() == []
 
         agent = registry.get_agent("test_agent")
-        assert agent is not None
-        assert agent.metadata.name == "test_agent"
+        version = registry.version
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        ) as agent.client:
+            # Probing the agent directly, not through the registry, updates the index
+            await agent.health_check()
+
+        assert registry.get_healthy_agents() == [agent]
+        assert registry.get_registry_stats()["status_breakdown"] == {AgentStatus.HEALTHY: 1}
+        assert registry.version == version + 1
+
+
+class TestIntentCache:
+    """Test IntentCache class."""
+
+    def test_identifiers_share_cached_classification(self):
+        """Test that queries differing only in identifiers hit the cache."""
+        cache = IntentCache()
+        cache.put("Where is bag NH459?", "scope", {"intent": "track baggage"})
+
+        assert cache.get("where is bag  AA123?", "scope") == {"intent": "track baggage"}
+        assert cache.get("Validate crew pay for trip 2847", "scope") is None
+
+    def test_scope_isolates_entries(self):
+        """Test that entries are not served across scopes."""
+        cache = IntentCache()
+        cache.put("Where is bag NH459?", "v1", {"intent": "track baggage"})
+
+        assert cache.get("Where is bag NH459?", "v2") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction once max_entries is exceeded."""
+        cache = IntentCache(max_entries=2, max_distance=0)
+        cache.put("track baggage", "s", {"intent": "a"})
+        cache.put("validate crew pay", "s", {"intent": "b"})
+        cache.get("track baggage", "s")
+        cache.put("flight delay analytics", "s", {"intent": "c"})
+
+        assert cache.get("track baggage", "s") == {"intent": "a"}
+        assert cache.get("validate crew pay", "s") is None
+
+
+class TestIntentClassifier:
+    """Test IntentClassifier class."""
+
+    def test_single_capability_requests_match(self):
+        """Test that unambiguous requests map to one capability."""
+        classifier = IntentClassifier()
+
+        assert classifier.classify("Where is bag NH459?").capability == "track"
+        assert classifier.classify(
+            "Validate crew member pay for trip 2847"
+        ).capability == "pay_validation"
+
+    def test_compound_requests_need_llm(self):
+        """Test that multi-part or unmatched requests fall through."""
+        classifier = IntentClassifier()
+
+        assert classifier.classify(
+            "Where is bag NH459 and will it make the connection?"
+        ) is None
+        assert classifier.classify(
+            "What's causing high baggage mishandling on route PTY-MIA?"
+        ) is None
+
+
+class TestResponseCache:
+    """Test ResponseCache class."""
 
     @pytest.mark.asyncio
-    async def test_get_agents_by_domain(self, config_file):
-        """Test getting agents by domain."""
-        registry = AgentRegistry(config_file)
-        await registry.load_agents()
+    async def test_key_ignores_case_and_spacing_but_not_identifiers(self):
+        """Test which requests share a cached response."""
+        store = {}
+        redis_client = Mock()
+        redis_client.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis_client.set = AsyncMock(side_effect=lambda key, value, ex: store.update({key: value}))
+        cache = ResponseCache(redis_client)
+
+        await cache.put("u", "s", "Where is bag NH459?", {}, {"success": True, "message": "MIA"})
+
+        assert await cache.get("u", "s", "where is  bag NH459?", {}) == {
+            "success": True, "message": "MIA"
+        }
+        assert await cache.get("u", "s", "Where is bag NH460?", {}) is None
+        assert await cache.get("other", "s", "Where is bag NH459?", {}) is None
+        assert await cache.get("u", "other", "Where is bag NH459?", {}) is None
+
+
+class TestRequestRouter:
+    """Test RequestRouter class."""
+
+    @pytest.fixture
+    def router(self):
+        """Create a router with mocked dependencies."""
+        return RequestRouter(
+            registry=Mock(),
+            context_manager=Mock(),
+            anthropic_api_key="test-key",
+        )
+
+    def test_routers_share_compiled_graph(self, router):
+        """Test that the compiled workflow is built once for all routers."""
+        other = RequestRouter(
+            registry=Mock(),
+            context_manager=Mock(),
+            anthropic_api_key="test-key",
+        )
 
-        agents = registry.get_agents_by_domain("test_domain")
-        assert len(agents) == 1
-        assert agents[0].metadata.name == "test_agent"
+        assert other.graph is router.graph
 
     @pytest.mark.asyncio
-    async def test_get_agents_by_capability(self, config_file):
-        """Test getting agents by capability."""
-        registry = AgentRegistry(config_file)
-        await registry.load_agents()
+    async def test_route_request_runs_steps_without_graph(self, router):
+        """Test that the linear workflow is awaited directly by default."""
+        calls = []
+
+        def step(name):
+            async def run(state):
+                calls.append(name)
+                state["final_response"] = {"success": True, "message": name}
+                return state
+            return run
+
+        with patch.multiple(
+            router,
+            _classify_intent=step("classify"),
+            _select_agents=step("select"),
+            _execute_agents=step("execute"),
+            _aggregate_responses=step("aggregate"),
+        ), patch.object(router, "graph") as graph:
+            response = await router.route_request("session-1", "user-1", "Where is my bag?")
+
+        assert calls == ["classify", "select", "execute", "aggregate"]
+        assert response == {"success": True, "message": "aggregate"}
+        graph.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cached_response_is_recorded_in_session(self, router):
+        """Test that a response cache hit records the turn and session after returning."""
+        cached = {"success": True, "message": "MIA", "agents_used": ["tracker", "risk"]}
+        router.response_cache = Mock(get=AsyncMock(return_value=cached))
+        router.context_manager = Mock(
+            begin_turn=AsyncMock(return_value="turn-1"),
+            save_agent_responses=AsyncMock(),
+            update_session=AsyncMock(),
+        )
+
+        with patch.object(router, "_run_pipeline") as pipeline:
+            response = await router.route_request("session-1", "user-1", "Where is my bag?")
+
+        assert response == cached
+        pipeline.assert_not_called()
+        router.response_cache.get.assert_awaited_once_with(
+            "user-1", "session-1", "Where is my bag?", {}
+        )
+        router.context_manager.begin_turn.assert_not_awaited()
+
+        await router.close()
+
+        router.context_manager.begin_turn.assert_awaited_once_with(
+            "session-1", "user-1", "Where is my bag?"
+        )
+        saved = router.context_manager.save_agent_responses.await_args.kwargs["responses"]
+        assert [(r.agent_name, r.message, r.metadata) for r in saved] == [(
+            "response_cache", "MIA", {"cached": True, "agents_used": ["tracker", "risk"]}
+        )]
+        router.context_manager.update_session.assert_awaited_once_with(
+            "session-1", agent_names=["tracker", "risk"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_stops_before_agents_run(self, router):
+        """Test that cancelling a request propagates instead of returning an error."""
+        classifying = asyncio.Event()
+
+        async def classify(state):
+            classifying.set()
+            await asyncio.sleep(10)
+
+        execute = AsyncMock()
+        with patch.multiple(router, _classify_intent=classify, _execute_agents=execute):
+            task = asyncio.create_task(
+                router.route_request("session-1", "user-1", "Where is my bag?")
+            )
+            await classifying.wait()
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        execute.assert_not_awaited()
+
+    def test_system_prompt_is_independent_of_registration_order(self, router):
+        """Test that the cached system prompt does not depend on registry order."""
+        agents = [
+            Mock(metadata=AgentMetadata(
+                name=name, domain=domain, url="http://test", capabilities=[name],
+                description="Test agent",
+            ))
+            for name, domain in [("track", "baggage"), ("pay", "crew")]
+        ]
+        router.registry.version = 1
+        router.registry.list_domains.return_value = ["baggage", "crew"]
+        router.registry.list_capabilities.return_value = ["track", "pay"]
+        router.registry.get_all_agents.return_value = agents
+        router._refresh_prompt_cache()
+        prompt = router._system_prompt
+
+        router.registry.version = 2
+        router.registry.list_domains.return_value = ["crew", "baggage"]
+        router.registry.list_capabilities.return_value = ["pay", "track"]
+        router.registry.get_all_agents.return_value = agents[::-1]
+        router._refresh_prompt_cache()
+
+        assert router._system_prompt == prompt
+        assert router._intent_cache_scope == (("baggage", "crew"), ("pay", "track"))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_classifications_share_one_call(self, router):
+        """Test that concurrent classifications are batched into one LLM call."""
+        classify = AsyncMock(side_effect=lambda messages: [
+            {"intent": message} for message in messages
+        ])
+
+        with patch.object(router, "_classify_messages", classify):
+            results = await asyncio.gather(*[
+                router._enqueue_classification(f"query {i}") for i in range(3)
+            ])
+
+        await router.close()
+
+        assert classify.await_count == 1
+        assert [r["intent"] for r in results] == ["query 0", "query 1", "query 2"]
+
+    def test_semantic_similarity_uses_token_overlap(self, router):
+        """Test capability similarity from token bitmasks."""
+        router._token_bits = {"baggage": 0, "risk": 1, "analysis": 2, "track": 3}
+        agent_masks = [("baggage_risk_analysis", 0b0111, 3), ("track", 0b1000, 1)]
+
+        cap_tokens = router._capability_tokens("risk_analysis")
+        similarity = RequestRouter._calculate_semantic_similarity(
+            router._capability_mask(cap_tokens), len(cap_tokens), agent_masks
+        )
+
+        assert similarity == pytest.approx(2 / 3)
+        assert RequestRouter._calculate_semantic_similarity(
+            router._capability_mask(router._capability_tokens("crew_pay")), 2, agent_masks
+        ) == 0.0
+
+    def test_circuit_breaker_opens_at_threshold_and_closes_on_success(self, router):
+        """Test router circuit breaker transitions."""
+        for _ in range(router.circuit_breaker_threshold - 1):
+            router._record_agent_failure("test_agent")
+        assert not router._is_circuit_breaker_open("test_agent")
+
+        router._record_agent_failure("test_agent")
+        assert router._is_circuit_breaker_open("test_agent")
+        assert router.get_routing_stats()["circuit_breakers_open"] == ["test_agent"]
+
+        router._record_agent_success("test_agent")
+        assert not router._is_circuit_breaker_open("test_agent")
+
+    def test_load_balancing_picks_least_loaded_across_candidate_sets(self, router):
+        """Test least-loaded selection stays correct when candidate sets overlap."""
+        picks = [router._select_agent_with_load_balancing(["a", "b"]) for _ in range(2)]
+        picks.append(router._select_agent_with_load_balancing(["a", "b", "c"]))
+        picks.append(router._select_agent_with_load_balancing(["a", "b"]))
+
+        assert picks == ["a", "b", "c", "a"]
+        assert router.agent_load_counter == {"a": 2, "b": 1, "c": 1}
+
+    @pytest.mark.asyncio
+    async def test_select_agents_matches_exact_then_semantic(self, router):
+        """Test exact matches skip open breakers and semantic matching fills gaps."""
+        agents = [
+            Mock(metadata=AgentMetadata(
+                name=name, domain="baggage_operations", url="http://localhost",
+                capabilities=capabilities, description=name,
+            ))
+            for name, capabilities in [
+                ("broken", ["track"]),
+                ("tracker", ["track"]),
+                ("analyzer", ["baggage_connection_risk_analysis"]),
+            ]
+        ]
+        router.registry.version = 1
+        router.registry.get_all_agents.return_value = agents
+        router.registry.agents_by_status = {
+            AgentStatus.HEALTHY: {"broken", "tracker", "analyzer"},
+        }
+        router._open_breakers.add("broken")
+
+        state = await router._select_agents({
+            "log": Mock(),
+            "capabilities_needed": ["track", "connection_risk_analysis"],
+            "urgency": "medium",
+            "domain": "baggage_operations",
+            "execution_mode": "sequential",
+            "fallback_attempted": False,
+        })
+
+        assert state["selected_agents"] == ["tracker", "analyzer"]
+
+    @pytest.mark.asyncio
+    async def test_select_agents_falls_back_to_healthy_domain_agent(self, router):
+        """Test fallback picks the first healthy domain agent with a closed breaker."""
+        router.registry.version = 1
+        router.registry.get_all_agents.return_value = [
+            Mock(metadata=AgentMetadata(
+                name=name, domain=domain, url="http://localhost",
+                capabilities=[name], description=name,
+            ))
+            for name, domain in [
+                ("pay", "crew_operations"),
+                ("down", "baggage_operations"),
+                ("broken", "baggage_operations"),
+                ("tracker", "baggage_operations"),
+            ]
+        ]
+        router.registry.agents_by_status = {
+            AgentStatus.HEALTHY: {"pay", "broken", "tracker"},
+        }
+        router._open_breakers.add("broken")
+
+        state = await router._select_agents({
+            "log": Mock(),
+            "capabilities_needed": ["rebooking"],
+            "urgency": "medium",
+            "domain": "baggage_operations",
+            "execution_mode": "parallel",
+            "fallback_attempted": False,
+        })
+
+        assert state["selected_agents"] == ["tracker"]
+        assert state["fallback_attempted"] is True
+
+    def test_single_agent_registry_skips_llm(self, router):
+        """Test that a registry with one agent is classified without the LLM."""
+        router.registry.version = 1
+        router.registry.get_all_agents.return_value = [
+            Mock(metadata=AgentMetadata(
+                name="tracer", domain="baggage_operations", url="http://localhost",
+                capabilities=["track", "locate"], description="Trace bags",
+            ))
+        ]
+        router.registry.agents_by_status = {}
+
+        classification = router._fast_classify("Is my suitcase going to make it?")
+
+        assert classification.domain == "baggage_operations"
+        assert classification.required_capabilities == ["track", "locate"]
+        assert router.fast_path_classifications == 1
+
+    @pytest.mark.asyncio
+    async def test_parallel_execution_cancels_agents_over_budget(self, router):
+        """Test that agents still running at the urgency budget are cancelled."""
+        async def execute(agent_name, request, log=None):
+            if agent_name == "slow":
+                await asyncio.sleep(10)
+            return AgentResponse(agent_name=agent_name, success=True)
+
+        state = {
+            "log": Mock(),
+            "session_id": "s",
+            "user_id": "u",
+            "message": "status of flight 100",
+            "context": {},
+            "urgency": "high",
+            "selected_agents": ["fast", "slow"],
+            "persist_tasks": [],
+            "aggregator": PartialAggregator(chained=False),
+        }
 
-        agents = registry.get_agents_by_capability("test")
-        assert len(agents) == 1
-        assert agents[0].metadata.name == "test_agent"
+        with patch.object(router, "_execute_agent_with_retry", execute), \
+                patch.object(router, "_schedule_persistence"), \
+                patch.dict(URGENCY_BUDGET, {"high": 0.05}):
+            responses = await router._execute_parallel(state)
+
+        assert [r.success for r in responses] == [True, False]
+        assert "budget" in responses[1].error
+        assert state["aggregator"].result()["agents_contributed"] == ["fast"]
+        assert router.agent_failure_counts == {"slow": 1}
+
+    def test_partial_aggregator_narrates_chain(self):
+        """Test incremental aggregation of a sequential chain."""
+        aggregator = PartialAggregator(chained=True)
+        aggregator.add(AgentResponse(
+            agent_name="tracker", success=True, message="Bag at MIA", data={"loc": "MIA"},
+        ))
+        aggregator.add(AgentResponse(agent_name="risk", success=False, error="timeout"))
+        aggregator.add(AgentResponse(agent_name="rebook", success=True, message="Rebooked"))
+
+        result = aggregator.result()
+
+        assert result["message"] == "tracker: Bag at MIA → rebook: Rebooked"
+        assert result["data"] == {"tracker": {"loc": "MIA"}}
+        assert result["execution_chain"] == ["tracker", "rebook"]
+        assert aggregator.errors == ["timeout"]
 
 
 if __name__ == "__main__":